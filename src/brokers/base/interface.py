@@ -3,6 +3,7 @@ Base Broker Interface and Common Types
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -267,6 +268,11 @@ class BrokerAdapter(ABC):
         """Add symbol to watchlist - optional implementation"""
         return False
 
+    # Trade updates (optional - not all brokers stream them)
+    def stream_trade_updates(self) -> AsyncIterator[dict[str, Any]] | None:
+        """Stream order updates as dicts with order_id and status - optional implementation, None when unsupported"""
+        return None
+
 
 class BrokerError(Exception):
     """Base broker error"""
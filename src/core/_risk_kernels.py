@@ -0,0 +1,43 @@
+"""
+Numeric kernels for risk management, JIT-compiled when numba is available
+"""
+
+import numpy as np
+
+from infra.jit import njit
+
+
+@njit(cache=True)
+def compute_risk_score(exposure_pct: float, pnl_pct: float, pos_count: float, dd_pct: float) -> float:
+    """Overall risk score 0-1, the mean of the exposure, P&L, concentration and drawdown factors capped at 1"""
+    factors = np.array(
+        [
+            exposure_pct / 100,  # Exposure risk
+            abs(pnl_pct) / 10,  # P&L volatility risk
+            pos_count / 50,  # Concentration risk
+            abs(dd_pct) / 20,  # Drawdown risk
+        ]
+    )
+    return float(np.minimum(1.0, factors).mean())
+
+
+@njit(cache=True)
+def stop_loss(entry: float, side_is_buy: bool, pct: float) -> float:
+    """Stop loss price pct percent against the position"""
+    stop_loss_multiplier = 1 - (pct / 100)
+
+    if side_is_buy:
+        return entry * stop_loss_multiplier
+    # sell/short
+    return entry * (2 - stop_loss_multiplier)
+
+
+@njit(cache=True)
+def take_profit(entry: float, side_is_buy: bool, pct: float) -> float:
+    """Take profit price pct percent in favour of the position"""
+    take_profit_multiplier = 1 + (pct / 100)
+
+    if side_is_buy:
+        return entry * take_profit_multiplier
+    # sell/short
+    return entry * (2 - take_profit_multiplier)
@@ -4,9 +4,10 @@ News Analyzer and Sentiment Analysis Module
 
 import logging
 import re
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
 from textblob import TextBlob
 
 from src.brokers.base import BrokerInterface
@@ -14,6 +15,40 @@ from src.brokers.base import BrokerInterface
 logger = logging.getLogger(__name__)
 
 
+_TOKEN_RE = re.compile(r"[A-Za-z]+")
+
+# Irregular and derived keyword forms; regular -s/-ed/-ing forms are generated by _inflections
+_IRREGULAR_FORMS = {
+    "beat": ("beaten",),
+    "drop": ("dropped", "dropping"),
+    "fall": ("fell", "fallen"),
+    "profit": ("profitable", "profitability"),
+    "rise": ("rose", "risen"),
+    "risk": ("risky", "riskier"),
+    "strong": ("stronger", "strongest"),
+    "success": ("successful", "successfully"),
+    "weak": ("weaker", "weakest", "weaken", "weakened", "weakening", "weakness"),
+}
+
+
+def _inflections(keyword: str) -> set[str]:
+    """The keyword with its plural, past and -ing forms, so inflected words in text still match it"""
+    if keyword.endswith("y") and keyword[-2:-1] not in "aeiou":
+        forms = {keyword[:-1] + "ies", keyword[:-1] + "ied", keyword + "ing"}
+    elif keyword.endswith("e"):
+        forms = {keyword + "s", keyword + "d", keyword[:-1] + "ing"}
+    elif keyword.endswith(("s", "x", "sh", "ch")):
+        forms = {keyword + "es", keyword + "ed", keyword + "ing"}
+    else:
+        forms = {keyword + "s", keyword + "ed", keyword + "ing"}
+    return {keyword, *forms, *_IRREGULAR_FORMS.get(keyword, ())}
+
+
+def _keyword_forms(keywords: list[str]) -> dict[str, str]:
+    """Map every form of every keyword to the keyword itself"""
+    return {form: keyword for keyword in keywords for form in _inflections(keyword)}
+
+
 class NewsAnalyzer:
     """
     Analyzes news sentiment and extracts trading signals from news data
@@ -80,6 +115,10 @@ class NewsAnalyzer:
             "report",
         ]
 
+        # Word form -> keyword maps for per-token keyword lookup
+        self._positive_forms = _keyword_forms(self.positive_keywords)
+        self._negative_forms = _keyword_forms(self.negative_keywords)
+
     def analyze_news_sentiment(self, news_articles: list[dict[str, Any]]) -> dict[str, Any]:
         """
         Analyze sentiment of news articles for a symbol
@@ -103,6 +142,7 @@ class NewsAnalyzer:
 
         sentiment_scores = []
         sentiment_labels = []
+        keyword_counts = [0, 0]
 
         for article in news_articles:
             # Combine title and content for analysis
@@ -113,7 +153,10 @@ class NewsAnalyzer:
 
             # Calculate sentiment using multiple methods
             textblob_sentiment = self._textblob_sentiment(text)
-            keyword_sentiment = self._keyword_sentiment(text)
+            positive_matches, negative_matches = self._keyword_counts(text)
+            keyword_sentiment = self._keyword_score(positive_matches, negative_matches)
+            keyword_counts[0] += positive_matches
+            keyword_counts[1] += negative_matches
 
             # Combine sentiments (weighted average)
             combined_sentiment = textblob_sentiment * 0.6 + keyword_sentiment * 0.4
@@ -158,6 +201,7 @@ class NewsAnalyzer:
             "negative_count": negative_count,
             "neutral_count": neutral_count,
             "raw_scores": sentiment_scores,
+            "keyword_counts": keyword_counts,
             "analysis_timestamp": datetime.now(),
         }
 
@@ -171,21 +215,28 @@ class NewsAnalyzer:
             logger.warning(f"TextBlob sentiment analysis failed: {e}")
             return 0.0
 
-    def _keyword_sentiment(self, text: str) -> float:
-        """Calculate sentiment based on keyword matching"""
-        text_lower = text.lower()
-
-        positive_matches = sum(1 for keyword in self.positive_keywords if keyword in text_lower)
-        negative_matches = sum(1 for keyword in self.negative_keywords if keyword in text_lower)
-
+    def _keyword_counts(self, text: str) -> tuple[int, int]:
+        """Count distinct positive and negative keywords among the words of text, in any inflected form"""
+        # Tokenize once; cost scales with text length rather than keyword count.
+        # Deduplicate before lowering so repeated words in long articles are folded once
+        tokens = {token.lower() for token in set(_TOKEN_RE.findall(text))}
+        positive, negative = self._positive_forms, self._negative_forms
+        return len({positive[token] for token in tokens & positive.keys()}), len({negative[token] for token in tokens & negative.keys()})
+
+    @staticmethod
+    def _keyword_score(positive_matches: int, negative_matches: int) -> float:
+        """Normalize keyword counts to the -1 to 1 range"""
         total_matches = positive_matches + negative_matches
 
         if total_matches == 0:
             return 0.0
 
-        # Normalize to -1 to 1 range
         return (positive_matches - negative_matches) / total_matches
 
+    def _keyword_sentiment(self, text: str) -> float:
+        """Calculate sentiment based on keyword matching"""
+        return self._keyword_score(*self._keyword_counts(text))
+
     def _empty_sentiment_result(self) -> dict[str, Any]:
         """Return empty sentiment result"""
         return {
@@ -211,24 +262,16 @@ class NewsAnalyzer:
         """
         signals = {}
 
+        # Compute the time window once as an epoch cutoff shared by all symbols
+        cutoff_ts = (datetime.now(UTC) - timedelta(hours=hours_back)).timestamp()
+
         for symbol in symbols:
             try:
                 # Get recent news for the symbol
                 news_articles = self.alpaca_client.trading.news.get_news(symbol=symbol, limit=20)
 
                 # Filter news by time window
-                cutoff_time = datetime.now() - timedelta(hours=hours_back)
-                recent_articles = []
-
-                for article in news_articles:
-                    try:
-                        # Parse article timestamp
-                        article_time = datetime.fromisoformat(article.get("publish_date", "").replace("Z", "+00:00"))
-                        if article_time >= cutoff_time:
-                            recent_articles.append(article)
-                    except Exception:
-                        # If timestamp parsing fails, include the article anyway
-                        recent_articles.append(article)
+                recent_articles = [article for article in news_articles if self._article_timestamp(article) >= cutoff_ts]
 
                 # Analyze sentiment
                 sentiment_result = self.analyze_news_sentiment(recent_articles)
@@ -253,6 +296,18 @@ class NewsAnalyzer:
 
         return signals
 
+    @staticmethod
+    def _article_timestamp(article: dict[str, Any]) -> float:
+        """Return the article publish time as epoch seconds (+inf if unparseable so it is kept)"""
+        try:
+            # fromisoformat accepts the trailing "Z" natively on Python 3.11+
+            article_time = datetime.fromisoformat(article.get("publish_date", ""))
+        except (TypeError, ValueError):
+            return float("inf")
+        if article_time.tzinfo is None:
+            article_time = article_time.replace(tzinfo=UTC)
+        return article_time.timestamp()
+
     def _sentiment_to_signal(self, symbol: str, sentiment_result: dict[str, Any]) -> dict[str, Any] | None:
         """Convert sentiment analysis to trading signal"""
         sentiment_score = sentiment_result["sentiment_score"]
@@ -312,23 +367,29 @@ class NewsAnalyzer:
 
                 # Aggregate sector sentiment
                 sector_scores = []
+                keyword_rows = []
                 total_articles = 0
 
                 for _symbol, signal_data in symbol_signals.items():
                     sentiment = signal_data["sentiment_analysis"]
                     if sentiment["article_count"] > 0:
                         sector_scores.append(sentiment["sentiment_score"])
+                        keyword_rows.append(sentiment.get("keyword_counts", (0, 0)))
                         total_articles += sentiment["article_count"]
 
                 if sector_scores:
                     avg_sentiment = sum(sector_scores) / len(sector_scores)
 
+                    # Sector-wide keyword tally over a contiguous [n_symbols, 2] (positive, negative) matrix
+                    positive_total, negative_total = np.asarray(keyword_rows, dtype=np.int32).sum(axis=0)
+
                     sector_sentiment[sector] = {
                         "average_sentiment": avg_sentiment,
                         "symbol_count": len(symbols),
                         "analyzed_symbols": len(sector_scores),
                         "total_articles": total_articles,
                         "sentiment_label": self._score_to_label(avg_sentiment),
+                        "keyword_sentiment": self._keyword_score(int(positive_total), int(negative_total)),
                         "symbol_details": symbol_signals,
                     }
                 else:
@@ -338,6 +399,7 @@ class NewsAnalyzer:
                         "analyzed_symbols": 0,
                         "total_articles": 0,
                         "sentiment_label": "neutral",
+                        "keyword_sentiment": 0.0,
                         "symbol_details": {},
                     }
 
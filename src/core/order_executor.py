@@ -3,18 +3,32 @@ Order Executor - Executes trading orders with retry logic and monitoring
 """
 
 import asyncio
+import contextlib
 import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from typing import Any
 
-from brokers.base.broker_adapter import BrokerAdapter
+import numpy as np
+
+from brokers.base import BrokerAdapter, BrokerConnectionError
 from db.models import Position, Signal
 
 logger = logging.getLogger(__name__)
 
+# Errors worth retrying; anything else (e.g. an order rejection) fails fast
+TRANSIENT_ORDER_ERRORS = (TimeoutError, BrokerConnectionError)
+MAX_RETRY_BACKOFF = 30  # seconds
+
+TERMINAL_ORDER_STATUSES = frozenset({"filled", "cancelled", "rejected"})
+MAX_BUFFERED_ORDER_UPDATES = 1024  # terminal updates kept for orders no monitor is waiting on yet
+
+MARKET_OPEN_CACHE_TTL = 60  # seconds
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class OrderConfig:
     """Order execution configuration"""
 
@@ -34,6 +48,62 @@ class OrderExecutor:
         self.broker_adapter = broker_adapter
         self.config = config or OrderConfig()
 
+        # Config is frozen, so bind the values read on every retry/monitor tick once
+        self._max_retries = self.config.max_retries
+        self._retry_delay = self.config.retry_delay
+        self._order_timeout = self.config.order_timeout
+
+        # Push-based order tracking, used when the broker streams trade updates
+        self._order_waiters: dict[str, asyncio.Future] = {}
+        self._order_updates: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._trade_stream_task: asyncio.Task | None = None
+
+        # Market hours change rarely, so share one broker lookup across bursts of orders
+        self._market_open_cache: tuple[float, bool] | None = None
+        self._market_open_lock = asyncio.Lock()
+
+    def _ensure_trade_stream(self) -> bool:
+        """Start consuming broker trade updates if the broker streams them, returns True when streaming"""
+        if self._trade_stream_task is None or self._trade_stream_task.done():
+            updates = self.broker_adapter.stream_trade_updates()
+            if updates is None:
+                return False
+            self._trade_stream_task = asyncio.create_task(self._trade_stream_loop(updates))
+
+        return True
+
+    async def _trade_stream_loop(self, updates: AsyncIterator[dict[str, Any]]) -> None:
+        """Hand terminal order updates to waiting monitors, buffering a bounded number for orders not yet awaited"""
+        try:
+            async for update in updates:
+                if update.get("status") not in TERMINAL_ORDER_STATUSES:
+                    continue
+
+                order_id = update["order_id"]
+                waiter = self._order_waiters.get(order_id)
+                if waiter is not None:
+                    if not waiter.done():
+                        waiter.set_result(update)
+                    continue
+
+                # A fill can arrive before submit returns its order id, so keep it for the monitor that follows
+                self._order_updates[order_id] = update
+                if len(self._order_updates) > MAX_BUFFERED_ORDER_UPDATES:
+                    self._order_updates.popitem(last=False)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"❌ Trade update stream failed: {e}")
+
+    async def close(self) -> None:
+        """Stop the trade update stream"""
+        if self._trade_stream_task and not self._trade_stream_task.done():
+            self._trade_stream_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._trade_stream_task
+        self._trade_stream_task = None
+
     async def execute_signal(self, signal: Signal, position_size: float) -> dict[str, Any]:
         """
         Execute a trading signal as an order
@@ -92,19 +162,23 @@ class OrderExecutor:
         }
 
     async def _execute_order_with_retry(self, order_params: dict[str, Any]) -> dict[str, Any]:
-        """Execute order with retry logic"""
+        """Execute order, retrying transient errors with exponential backoff"""
 
-        last_error = None
+        attempt = 0
 
-        for attempt in range(self.config.max_retries):
+        while True:
+            attempt += 1
             try:
-                logger.info(f"🔄 Order attempt {attempt + 1}/{self.config.max_retries}")
+                logger.info(f"🔄 Order attempt {attempt}/{self._max_retries}")
+
+                # Listen for trade updates before submitting, so an immediate fill is not missed
+                streaming = self._ensure_trade_stream()
 
                 # Submit order
                 order_id = await self.broker_adapter.submit_order(**order_params)
 
                 # Monitor order status
-                order_status = await self._monitor_order_status(order_id)
+                order_status = await self._monitor_order_status(order_id, streaming=streaming)
 
                 return {
                     "order_id": order_id,
@@ -116,39 +190,60 @@ class OrderExecutor:
                     "filled_price": order_status.get("filled_price"),
                 }
 
-            except Exception as e:
-                last_error = e
-                logger.warning(f"⚠️ Order attempt {attempt + 1} failed: {e}")
+            except TRANSIENT_ORDER_ERRORS as e:
+                if attempt >= self._max_retries:
+                    raise
 
-                if attempt < self.config.max_retries - 1:
-                    await asyncio.sleep(self.config.retry_delay)
+                backoff = min(self._retry_delay * 2 ** (attempt - 1), MAX_RETRY_BACKOFF)
+                logger.warning(f"⚠️ Order attempt {attempt} failed: {e}, retrying in {backoff}s")
+                await asyncio.sleep(backoff)
 
-        # All retries failed
-        raise last_error
+    async def _monitor_order_status(self, order_id: str, *, streaming: bool = False) -> dict[str, Any]:
+        """Monitor order status until filled or timeout, from the trade update stream when streaming"""
 
-    async def _monitor_order_status(self, order_id: str) -> dict[str, Any]:
-        """Monitor order status until filled or timeout"""
+        if streaming:
+            return await self._wait_for_order_update(order_id)
 
-        start_time = datetime.now()
-        timeout = timedelta(seconds=self.config.order_timeout)
+        try:
+            # The event loop tracks the deadline, so polling needs no clock reads of its own
+            return await asyncio.wait_for(self._poll_until_terminal(order_id), timeout=self._order_timeout)
 
-        while datetime.now() - start_time < timeout:
-            try:
-                order_status = await self.broker_adapter.get_order_status(order_id)
+        except TimeoutError:
+            logger.warning(f"⏰ Order monitoring timeout for {order_id}")
+
+        except Exception as e:
+            logger.exception(f"❌ Error checking order status: {e}")
 
-                if order_status["status"] in ["filled", "cancelled", "rejected"]:
-                    return order_status
+        return {"status": "timeout", "order_id": order_id}
 
-                # Wait before checking again
-                await asyncio.sleep(2)
+    async def _poll_until_terminal(self, order_id: str) -> dict[str, Any]:
+        """Poll order status until it reaches a terminal state"""
+        while True:
+            order_status = await self.broker_adapter.get_order_status(order_id)
 
-            except Exception as e:
-                logger.exception(f"❌ Error checking order status: {e}")
-                break
+            if order_status["status"] in TERMINAL_ORDER_STATUSES:
+                return order_status
 
-        # Timeout reached
-        logger.warning(f"⏰ Order monitoring timeout for {order_id}")
-        return {"status": "timeout", "order_id": order_id}
+            # Wait before checking again
+            await asyncio.sleep(2)
+
+    async def _wait_for_order_update(self, order_id: str) -> dict[str, Any]:
+        """Wait for the trade update stream to report a terminal status for the order"""
+        update = self._order_updates.pop(order_id, None)
+        if update is not None:
+            return update
+
+        waiter = self._order_waiters[order_id] = asyncio.get_running_loop().create_future()
+
+        try:
+            return await asyncio.wait_for(waiter, timeout=self._order_timeout)
+
+        except TimeoutError:
+            logger.warning(f"⏰ Order monitoring timeout for {order_id}")
+            return {"status": "timeout", "order_id": order_id}
+
+        finally:
+            self._order_waiters.pop(order_id, None)
 
     async def exit_position(self, position: Position) -> dict[str, Any]:
         """Exit an existing position"""
@@ -210,30 +305,40 @@ class OrderExecutor:
             logger.exception(f"❌ Failed to get order history: {e}")
             return []
 
+    async def _get_order_stats(self, days: int) -> dict[str, Any]:
+        """Get order counts and execution times from recent order history in one pass"""
+        orders = await self.get_order_history(days=days)
+        status_counts = Counter(order["status"] for order in orders)
+        exec_times = np.fromiter(
+            ((order["filled_at"] - order["created_at"]).total_seconds() for order in orders if order["filled_at"] and order["created_at"]),
+            dtype=np.float64,
+        )
+
+        return {
+            "total": len(orders),
+            "filled": status_counts["filled"],
+            "cancelled": status_counts["cancelled"],
+            "exec_times": exec_times,
+        }
+
     async def get_execution_metrics(self) -> dict[str, Any]:
         """Get order execution performance metrics"""
         try:
-            # Get recent orders
-            orders = await self.get_order_history(days=30)
+            # Get recent order stats
+            stats = await self._get_order_stats(days=30)
 
-            if not orders:
+            total_orders = stats["total"]
+            if not total_orders:
                 return {"message": "No orders found"}
 
             # Calculate metrics
-            total_orders = len(orders)
-            filled_orders = len([o for o in orders if o["status"] == "filled"])
-            cancelled_orders = len([o for o in orders if o["status"] == "cancelled"])
-
-            fill_rate = filled_orders / total_orders if total_orders > 0 else 0
+            filled_orders = stats["filled"]
+            cancelled_orders = stats["cancelled"]
+            fill_rate = filled_orders / total_orders
 
             # Calculate average execution time
-            execution_times = []
-            for order in orders:
-                if order["filled_at"] and order["created_at"]:
-                    exec_time = (order["filled_at"] - order["created_at"]).total_seconds()
-                    execution_times.append(exec_time)
-
-            avg_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
+            execution_times = stats["exec_times"]
+            avg_execution_time = float(execution_times.mean()) if execution_times.size else 0
 
             return {
                 "total_orders": total_orders,
@@ -247,6 +352,18 @@ class OrderExecutor:
             logger.exception(f"❌ Failed to calculate execution metrics: {e}")
             return {"error": str(e)}
 
+    async def _is_market_open_cached(self) -> bool:
+        """Check market hours, reusing the broker answer for MARKET_OPEN_CACHE_TTL seconds"""
+        async with self._market_open_lock:
+            if self._market_open_cache is not None:
+                cached_at, market_open = self._market_open_cache
+                if time.monotonic() - cached_at < MARKET_OPEN_CACHE_TTL:
+                    return market_open
+
+            market_open = await self.broker_adapter.is_market_open()
+            self._market_open_cache = (time.monotonic(), market_open)
+            return market_open
+
     async def validate_order(self, order_params: dict[str, Any]) -> dict[str, Any]:
         """Validate order parameters before execution"""
 
@@ -271,7 +388,7 @@ class OrderExecutor:
 
         # Check market hours
         try:
-            market_open = await self.broker_adapter.is_market_open()
+            market_open = await self._is_market_open_cached()
             if not market_open:
                 validation_results["warnings"].append("Market is currently closed")
         except Exception as e:
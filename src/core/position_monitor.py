@@ -2,17 +2,85 @@
 Position Monitor - Monitors open positions and manages exits
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
+
+import numpy as np
 
 from brokers.base.broker_adapter import BrokerAdapter
+from infra.jit import njit
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+MAX_CONCURRENT_BROKER_REQUESTS = 8
+MONITOR_BATCH_SIZE = 16
+PRICE_CACHE_TTL = 0.5  # seconds, long enough to share prices within one monitoring tick
+TECHNICAL_BAR_SECONDS = 60  # technical exit signals only change when a new bar starts
+
+
+@dataclass(slots=True)
+class _PositionsView:
+    """Struct-of-arrays view over broker positions, built once per tick"""
+
+    symbols: list[str]
+    sides: list[str]
+    entry: np.ndarray
+    quantity: np.ndarray
+    sign: np.ndarray  # +1 long, -1 short, so side handling is a broadcast multiply
+    created_at: np.ndarray  # datetime64[s], NaT where the entry time is unknown
+
+    def prices(self, current_prices: dict[str, float]) -> np.ndarray:
+        """Current prices aligned with the view"""
+        return np.fromiter((current_prices[symbol] for symbol in self.symbols), dtype=np.float64, count=len(self.symbols))
+
+
+def _local_naive(moment: datetime | None) -> datetime | None:
+    """moment on the naive local clock that snapshot times use; aware times are converted, None is kept"""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
+
+
+def _build_view(positions: list) -> _PositionsView:
+    """Convert broker position objects into a _PositionsView, converting Decimal fields to float exactly once"""
+    count = len(positions)
+    sides = [position.side for position in positions]
+
+    # Entry times on the same naive clock as taken_at; numpy would drop a UTC offset silently, and positions without one read as NaT
+    created_at = np.array([_local_naive(getattr(position, "created_at", None)) for position in positions], dtype="datetime64[s]")
+
+    return _PositionsView(
+        symbols=[position.symbol for position in positions],
+        sides=sides,
+        entry=np.fromiter((float(position.avg_entry_price) for position in positions), dtype=np.float64, count=count),
+        quantity=np.fromiter((float(position.qty) for position in positions), dtype=np.float64, count=count),
+        sign=np.where(np.array(sides) == "long", 1.0, -1.0),
+        created_at=created_at,
+    )
+
+
+@njit(cache=True)
+def _compute_exit_masks(  # noqa: PLR0917 - numba kernels take their arrays positionally
+    entry: np.ndarray,
+    price: np.ndarray,
+    quantity: np.ndarray,
+    sign: np.ndarray,
+    stop_loss_percent: float,
+    take_profit_percent: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """P&L, P&L percent (0 where the entry price is unknown) and stop-loss / take-profit masks"""
+    price_move = sign * (price - entry)
+    pnl = price_move * quantity
+    has_entry = entry > 0
+    pnl_percent = np.where(has_entry, price_move / np.where(has_entry, entry, 1.0), 0.0)
+    return pnl, pnl_percent, pnl_percent <= -stop_loss_percent, pnl_percent >= take_profit_percent
+
+
+@dataclass(slots=True)
 class ExitCondition:
     """Exit condition configuration"""
 
@@ -21,6 +89,21 @@ class ExitCondition:
     trailing_stop_percent: float = 0.02  # 2% trailing stop
     max_holding_period_days: int = 30  # Maximum holding period
     min_holding_period_minutes: int = 60  # Minimum holding period
+    max_concurrency: int = MAX_CONCURRENT_BROKER_REQUESTS  # Maximum in-flight broker calls
+
+
+@dataclass(slots=True)
+class PositionSnapshot:
+    """Positions, prices and derived P&L arrays captured once per monitoring tick"""
+
+    positions: list
+    view: _PositionsView
+    price: np.ndarray
+    pnl: np.ndarray
+    pnl_percent: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    taken_at: datetime
 
 
 class PositionMonitor:
@@ -28,6 +111,14 @@ class PositionMonitor:
     Monitors open positions and manages exit conditions
     """
 
+    _URGENCY_MAP: ClassVar[dict[str, str]] = {
+        "stop_loss": "high",
+        "take_profit": "medium",
+        "trailing_stop": "medium",
+        "max_holding_period": "low",
+        "technical_exit": "medium",
+    }
+
     def __init__(
         self,
         broker_adapter: BrokerAdapter,
@@ -35,131 +126,222 @@ class PositionMonitor:
     ) -> None:
         self.broker_adapter = broker_adapter
         self.exit_conditions = exit_conditions or ExitCondition()
+        # Caps in-flight broker calls so concurrent fetches don't trip the broker rate limit
+        self._broker_sem = asyncio.Semaphore(self.exit_conditions.max_concurrency or MAX_CONCURRENT_BROKER_REQUESTS)
+        self._price_cache: dict[str, tuple[float, float]] = {}  # symbol -> (price, monotonic fetch time)
+        self._technical_exit_cache: dict[tuple[str, str], tuple[int, bool]] = {}  # (symbol, side) -> (bar, signal)
 
-    async def monitor_positions(self) -> dict[str, Any]:
+    async def monitor_positions(self, snap: PositionSnapshot | None = None) -> dict[str, Any]:
         """
         Monitor all open positions for exit conditions
 
+        Args:
+            snap: Snapshot to evaluate, shared with the other monitor methods in the same tick.
+                  Positions and prices are fetched when not supplied.
+
         Returns:
             Dictionary with monitoring results
         """
         logger.info("👁️ Monitoring open positions")
 
         try:
-            # Get current positions
-            positions = await self.broker_adapter.get_positions()
+            if snap is not None:
+                positions = snap.positions
+                now = snap.taken_at
+                exit_signals = await self._evaluate_exits(snap) if positions else []
+            else:
+                # Get current positions
+                positions = await self._get_positions()
+
+                # One timestamp for the whole tick
+                now = datetime.now()
+                exit_signals = await self._monitor_in_batches(positions, now) if positions else []
 
             if not positions:
                 logger.info("📊 No open positions to monitor")
                 return {"positions_monitored": 0, "exit_signals": []}
 
-            exit_signals = []
-
-            # Check each position
-            for position in positions:
-                exit_signal = await self._check_position_exit(position)
-                if exit_signal:
-                    exit_signals.append(exit_signal)
-
-            logger.info(f"✅ Position monitoring completed: {len(positions)} positions, {len(exit_signals)} exit signals")
+            logger.info("✅ Position monitoring completed: %s positions, %s exit signals", len(positions), len(exit_signals))
 
             return {
                 "positions_monitored": len(positions),
                 "exit_signals": exit_signals,
-                "monitoring_time": datetime.now(),
+                "monitoring_time": now,
             }
 
         except Exception as e:
-            logger.exception(f"❌ Position monitoring failed: {e}")
+            logger.exception("❌ Position monitoring failed: %s", e)
             return {"error": str(e)}
 
-    async def _check_position_exit(self, position) -> dict[str, Any] | None:
+    async def _monitor_in_batches(self, positions: list, now: datetime) -> list[dict[str, Any]]:
+        """Evaluate exits batch by batch so price fetches for the next batch overlap evaluation of the current one"""
+        batches: asyncio.Queue = asyncio.Queue()
+
+        async def fetch_batches() -> None:
+            try:
+                for start in range(0, len(positions), MONITOR_BATCH_SIZE):
+                    batch = positions[start : start + MONITOR_BATCH_SIZE]
+                    await batches.put(self._build_snapshot(batch, await self._get_current_prices([position.symbol for position in batch]), now))
+            finally:
+                await batches.put(None)
+
+        async def evaluate_batches() -> list[dict[str, Any]]:
+            exit_signals = []
+            while (batch_snap := await batches.get()) is not None:
+                exit_signals.extend(await self._evaluate_exits(batch_snap))
+            return exit_signals
+
+        _, exit_signals = await asyncio.gather(fetch_batches(), evaluate_batches())
+        return exit_signals
+
+    async def snapshot(self) -> PositionSnapshot:
         """
-        Check if a position should be exited
+        Capture positions, prices and vectorized P&L once so that monitor_positions,
+        get_position_summary and get_position_alerts can share them within a tick
+        """
+        positions = await self._get_positions()
+        current_prices = await self._get_current_prices([position.symbol for position in positions])
+        return self._build_snapshot(positions, current_prices, datetime.now())
+
+    def _build_snapshot(self, positions: list, current_prices: dict[str, float], now: datetime) -> PositionSnapshot:
+        """Run the vectorized P&L and stop-loss / take-profit evaluation for positions, skipping those without a price"""
+        priced = [position for position in positions if position.symbol in current_prices]
+        if len(priced) < len(positions):
+            logger.warning("⚠️ Skipping %s positions without a current price", len(positions) - len(priced))
+            positions = priced
+
+        view = _build_view(positions)
+        price = view.prices(current_prices)
+        pnl, pnl_percent, stop_loss, take_profit = _compute_exit_masks(
+            view.entry,
+            price,
+            view.quantity,
+            view.sign,
+            self.exit_conditions.stop_loss_percent,
+            self.exit_conditions.take_profit_percent,
+        )
+        return PositionSnapshot(
+            positions=positions,
+            view=view,
+            price=price,
+            pnl=pnl,
+            pnl_percent=pnl_percent,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            taken_at=now,
+        )
+
+    async def _evaluate_exits(self, snap: PositionSnapshot) -> list[dict[str, Any]]:
+        """Evaluate exit conditions for the positions in a snapshot and build their exit signals"""
+        positions, price, stop_loss, take_profit = snap.positions, snap.price, snap.stop_loss, snap.take_profit
+        max_holding_period = self._max_holding_period_mask(snap.view.created_at, snap.taken_at)
+
+        exit_reasons = np.select(
+            [stop_loss, take_profit, max_holding_period],
+            ["stop_loss", "take_profit", "max_holding_period"],
+            default="",
+        ).astype(object)
+
+        # Only positions that passed every cheap vector check need the awaited (slower) checks
+        remaining = np.flatnonzero(~(stop_loss | take_profit | max_holding_period))
+        results = await asyncio.gather(*(self._check_position_exit(positions[i], float(price[i])) for i in remaining), return_exceptions=True)
+        for i, result in zip(remaining, results, strict=True):
+            if isinstance(result, str):
+                exit_reasons[i] = result
+
+        return [self._build_exit_signal(snap, i, exit_reasons[i]) for i in np.flatnonzero(exit_reasons != "")]
+
+    def _build_exit_signal(self, snap: PositionSnapshot, i: int, exit_reason: str) -> dict[str, Any]:
+        """Build the exit signal for the position at index i of a snapshot"""
+        symbol = snap.view.symbols[i]
+        logger.info("🚪 Exit signal generated: %s - %s", symbol, exit_reason)
+        return {
+            "symbol": symbol,
+            "exit_reason": exit_reason,
+            "current_price": float(snap.price[i]),
+            "entry_price": float(snap.view.entry[i]),
+            "pnl": float(snap.pnl[i]),
+            "pnl_percent": float(snap.pnl_percent[i]),
+            "quantity": float(snap.view.quantity[i]),
+            "side": snap.view.sides[i],
+            "urgency": self._get_exit_urgency(exit_reason),
+        }
+
+    async def _get_positions(self) -> list:
+        """Fetch open positions under the broker call limit"""
+        async with self._broker_sem:
+            return await self.broker_adapter.get_positions()
+
+    async def _get_current_price(self, symbol: str) -> float:
+        """Fetch a current price, bounding how many lookups run concurrently"""
+        async with self._broker_sem:
+            return await self.broker_adapter.get_current_price(symbol)
+
+    async def _get_current_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Get current prices for several symbols, reusing prices fetched within PRICE_CACHE_TTL"""
+        now = time.monotonic()
+        prices = {}
+        missing = []
+
+        for symbol in dict.fromkeys(symbols):
+            cached = self._price_cache.get(symbol)
+            if cached and now - cached[1] < PRICE_CACHE_TTL:
+                prices[symbol] = cached[0]
+            else:
+                missing.append(symbol)
+
+        if missing:
+            fetched = await self._fetch_current_prices(missing)
+            fetched_at = time.monotonic()
+            for symbol, price in fetched.items():
+                self._price_cache[symbol] = (price, fetched_at)
+            prices.update(fetched)
+
+        return prices
+
+    async def _fetch_current_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Fetch current prices from the broker concurrently, leaving out symbols whose lookup failed"""
+        results = await asyncio.gather(*(self._get_current_price(symbol) for symbol in symbols), return_exceptions=True)
+
+        prices = {}
+        for symbol, result in zip(symbols, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error("❌ Error fetching price for %s: %s", symbol, result, exc_info=result)
+            elif result is None:
+                logger.warning("⚠️ No current price for %s", symbol)
+            else:
+                prices[symbol] = result
+        return prices
+
+    async def _check_position_exit(self, position, current_price: float) -> str | None:
+        """
+        Check the exit conditions not covered by the vectorized thresholds
 
         Args:
             position: Position object from broker
+            current_price: Latest price for the position symbol
 
         Returns:
-            Exit signal dictionary if position should be exited, None otherwise
+            Exit reason if position should be exited, None otherwise
         """
-        symbol = position.symbol
-
         try:
-            # Get current price
-            current_price = await self.broker_adapter.get_current_price(symbol)
-
-            # Calculate position metrics
-            entry_price = float(position.avg_entry_price)
-            quantity = float(position.qty)
-
-            # Calculate P&L
-            if position.side == "long":
-                pnl = (current_price - entry_price) * quantity
-                pnl_percent = (current_price - entry_price) / entry_price
-            else:  # short position
-                pnl = (entry_price - current_price) * quantity
-                pnl_percent = (entry_price - current_price) / entry_price
-
-            # Check exit conditions
-            exit_reason = None
-
-            # 1. Stop Loss Check
-            if pnl_percent <= -self.exit_conditions.stop_loss_percent:
-                exit_reason = "stop_loss"
-
-            # 2. Take Profit Check
-            elif pnl_percent >= self.exit_conditions.take_profit_percent:
-                exit_reason = "take_profit"
-
-            # 3. Maximum Holding Period Check
-            elif self._check_max_holding_period(position):
-                exit_reason = "max_holding_period"
+            # 1. Trailing Stop Check
+            if await self._check_trailing_stop(position, current_price):
+                return "trailing_stop"
 
-            # 4. Trailing Stop Check
-            elif await self._check_trailing_stop(position, current_price):
-                exit_reason = "trailing_stop"
-
-            # 5. Technical Exit Signal Check
-            elif await self._check_technical_exit(symbol, position.side):
-                exit_reason = "technical_exit"
-
-            if exit_reason:
-                logger.info(f"🚪 Exit signal generated: {symbol} - {exit_reason}")
-
-                return {
-                    "symbol": symbol,
-                    "exit_reason": exit_reason,
-                    "current_price": current_price,
-                    "entry_price": entry_price,
-                    "pnl": pnl,
-                    "pnl_percent": pnl_percent,
-                    "quantity": quantity,
-                    "side": position.side,
-                    "urgency": self._get_exit_urgency(exit_reason),
-                }
+            # 2. Technical Exit Signal Check
+            if await self._check_technical_exit_cached(position.symbol, position.side):
+                return "technical_exit"
 
         except Exception as e:
-            logger.exception(f"❌ Error checking exit for {symbol}: {e}")
+            logger.exception("❌ Error checking exit for %s: %s", position.symbol, e)
 
         return None
 
-    def _check_max_holding_period(self, position) -> bool:
-        """Check if position has exceeded maximum holding period"""
-        try:
-            # Get position entry time (this would come from your database)
-            # For now, assume we can get it from the position object
-            if hasattr(position, "created_at"):
-                entry_time = position.created_at
-                holding_period = datetime.now() - entry_time
-
-                if holding_period.days >= self.exit_conditions.max_holding_period_days:
-                    return True
-
-        except Exception as e:
-            logger.exception(f"❌ Error checking holding period: {e}")
-
-        return False
+    def _max_holding_period_mask(self, entry_times: np.ndarray, now: datetime) -> np.ndarray:
+        """Flag positions that have exceeded the maximum holding period (NaT entry times never do)"""
+        holding_period = np.datetime64(now, "s") - entry_times
+        return holding_period >= np.timedelta64(self.exit_conditions.max_holding_period_days, "D")
 
     async def _check_trailing_stop(self, position, current_price: float) -> bool:
         """Check trailing stop condition"""
@@ -170,9 +352,20 @@ class PositionMonitor:
             return False
 
         except Exception as e:
-            logger.exception(f"❌ Error checking trailing stop: {e}")
+            logger.exception("❌ Error checking trailing stop: %s", e)
             return False
 
+    async def _check_technical_exit_cached(self, symbol: str, side: str) -> bool:
+        """Check technical exit signals at most once per bar for each symbol and side"""
+        bar = int(time.time() // TECHNICAL_BAR_SECONDS)
+        cached = self._technical_exit_cache.get((symbol, side))
+        if cached and cached[0] == bar:
+            return cached[1]
+
+        signal = await self._check_technical_exit(symbol, side)
+        self._technical_exit_cache[symbol, side] = (bar, signal)
+        return signal
+
     async def _check_technical_exit(self, symbol: str, side: str) -> bool:
         """Check technical analysis exit signals"""
         try:
@@ -184,25 +377,20 @@ class PositionMonitor:
             return False
 
         except Exception as e:
-            logger.exception(f"❌ Error checking technical exit: {e}")
+            logger.exception("❌ Error checking technical exit: %s", e)
             return False
 
     def _get_exit_urgency(self, exit_reason: str) -> str:
         """Get urgency level for exit signal"""
-        urgency_map = {
-            "stop_loss": "high",
-            "take_profit": "medium",
-            "trailing_stop": "medium",
-            "max_holding_period": "low",
-            "technical_exit": "medium",
-        }
+        return self._URGENCY_MAP.get(exit_reason, "medium")
 
-        return urgency_map.get(exit_reason, "medium")
-
-    async def get_position_summary(self) -> dict[str, Any]:
-        """Get summary of all positions"""
+    async def get_position_summary(self, snap: PositionSnapshot | None = None) -> dict[str, Any]:
+        """Get summary of all positions, optionally from a snapshot shared within the tick"""
         try:
-            positions = await self.broker_adapter.get_positions()
+            if snap is None:
+                snap = await self.snapshot()
+
+            positions = snap.positions
 
             if not positions:
                 return {"message": "No open positions"}
@@ -216,92 +404,99 @@ class PositionMonitor:
                 "positions": [],
             }
 
-            for position in positions:
-                # Get current price
-                current_price = await self.broker_adapter.get_current_price(position.symbol)
-
-                # Calculate metrics
-                entry_price = float(position.avg_entry_price)
-                quantity = float(position.qty)
-                market_value = current_price * abs(quantity)
-
-                if position.side == "long":
-                    summary["long_positions"] += 1
-                    unrealized_pnl = (current_price - entry_price) * quantity
-                else:
-                    summary["short_positions"] += 1
-                    unrealized_pnl = (entry_price - current_price) * quantity
-
-                summary["total_market_value"] += market_value
-                summary["total_unrealized_pnl"] += unrealized_pnl
-
-                # Add position details
-                summary["positions"].append(
-                    {
-                        "symbol": position.symbol,
-                        "side": position.side,
-                        "quantity": quantity,
-                        "entry_price": entry_price,
-                        "current_price": current_price,
-                        "market_value": market_value,
-                        "unrealized_pnl": unrealized_pnl,
-                        "pnl_percent": unrealized_pnl / (entry_price * abs(quantity)) if entry_price > 0 else 0,
-                    }
+            # Calculate metrics for all positions at once
+            view, price, unrealized_pnl = snap.view, snap.price, snap.pnl
+            abs_quantity = np.abs(view.quantity)
+            market_value = price * abs_quantity
+            pnl_percent = np.divide(unrealized_pnl, view.entry * abs_quantity, out=np.zeros_like(unrealized_pnl), where=(view.entry > 0) & (abs_quantity > 0))
+
+            summary["total_market_value"] = float(market_value.sum())
+            summary["total_unrealized_pnl"] = float(unrealized_pnl.sum())
+
+            # Position details, built in one pass over plain Python floats
+            summary["positions"] = [
+                {
+                    "symbol": symbol,
+                    "side": side,
+                    "quantity": quantity,
+                    "entry_price": entry_price,
+                    "current_price": current_price,
+                    "market_value": position_market_value,
+                    "unrealized_pnl": position_unrealized_pnl,
+                    "pnl_percent": position_pnl_percent,
+                }
+                for symbol, side, quantity, entry_price, current_price, position_market_value, position_unrealized_pnl, position_pnl_percent in zip(
+                    view.symbols,
+                    view.sides,
+                    view.quantity.tolist(),
+                    view.entry.tolist(),
+                    price.tolist(),
+                    market_value.tolist(),
+                    unrealized_pnl.tolist(),
+                    pnl_percent.tolist(),
+                    strict=True,
                 )
+            ]
+
+            summary["long_positions"] = int((view.sign > 0).sum())
+            summary["short_positions"] = len(positions) - summary["long_positions"]
 
             return summary
 
         except Exception as e:
-            logger.exception(f"❌ Failed to get position summary: {e}")
+            logger.exception("❌ Failed to get position summary: %s", e)
             return {"error": str(e)}
 
-    async def get_position_alerts(self) -> list[dict[str, Any]]:
-        """Get alerts for positions requiring attention"""
+    async def get_position_alerts(self, snap: PositionSnapshot | None = None) -> list[dict[str, Any]]:
+        """Get alerts for positions requiring attention, optionally from a snapshot shared within the tick"""
         alerts = []
 
         try:
-            positions = await self.broker_adapter.get_positions()
+            if snap is None:
+                snap = await self.snapshot()
+
+            view, pnl_percent = snap.view, snap.pnl_percent
 
-            for position in positions:
-                current_price = await self.broker_adapter.get_current_price(position.symbol)
-                entry_price = float(position.avg_entry_price)
+            # Alert conditions as masks; only flagged positions are visited below
+            large_loss = pnl_percent <= -0.05  # 5% loss
+            large_gain = ~large_loss & (pnl_percent >= 0.15)  # 15% gain
+            near_stop_loss = np.abs(pnl_percent + self.exit_conditions.stop_loss_percent) < 0.005  # Within 0.5% of stop
 
-                # Calculate P&L percentage
-                pnl_percent = (current_price - entry_price) / entry_price if position.side == "long" else (entry_price - current_price) / entry_price
+            for i in np.flatnonzero(large_loss | large_gain | near_stop_loss):
+                symbol = view.symbols[i]
+                position_pnl_percent = float(pnl_percent[i])
 
-                # Check for alert conditions
-                if pnl_percent <= -0.05:  # 5% loss
+                if large_loss[i]:
                     alerts.append(
                         {
-                            "symbol": position.symbol,
+                            "symbol": symbol,
                             "alert_type": "large_loss",
-                            "pnl_percent": pnl_percent,
-                            "message": f"{position.symbol} down {pnl_percent:.1%}",
+                            "pnl_percent": position_pnl_percent,
+                            "message": f"{symbol} down {position_pnl_percent:.1%}",
                         }
                     )
 
-                elif pnl_percent >= 0.15:  # 15% gain
+                elif large_gain[i]:
                     alerts.append(
                         {
-                            "symbol": position.symbol,
+                            "symbol": symbol,
                             "alert_type": "large_gain",
-                            "pnl_percent": pnl_percent,
-                            "message": f"{position.symbol} up {pnl_percent:.1%}",
+                            "pnl_percent": position_pnl_percent,
+                            "message": f"{symbol} up {position_pnl_percent:.1%}",
                         }
                     )
 
-                # Check for positions near stop loss
-                if abs(pnl_percent + self.exit_conditions.stop_loss_percent) < 0.005:  # Within 0.5% of stop
+                if near_stop_loss[i]:
                     alerts.append(
                         {
-                            "symbol": position.symbol,
+                            "symbol": symbol,
                             "alert_type": "near_stop_loss",
-                            "pnl_percent": pnl_percent,
-                            "message": f"{position.symbol} approaching stop loss",
+                            "pnl_percent": position_pnl_percent,
+                            "message": f"{symbol} approaching stop loss",
                         }
                     )
 
         except Exception as e:
-            logger.exception(f"❌ Error generating position alerts: {e}")
+            logger.exception("❌ Error generating position alerts: %s", e)
 
         return alerts
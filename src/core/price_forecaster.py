@@ -2,120 +2,427 @@
 Enhanced Price Forecasting Module
 """
 
+import hashlib
+import heapq
 import logging
+import threading
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
+import joblib
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
-from sklearn.preprocessing import StandardScaler
 
 from src.brokers.base import BrokerInterface
+from src.infra.jit import njit
+from src.infra.path_utils import get_data_dir
+
+try:
+    import compiledtrees
+
+    COMPILEDTREES_AVAILABLE = True
+except ImportError:  # compiledtrees is optional, forests then predict through sklearn
+    compiledtrees = None
+    COMPILEDTREES_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+FETCH_WORKERS = 8  # concurrent history downloads
+PREDICT_HISTORY_DAYS = 200  # enough data for features
+RETRAIN_HISTORY_DAYS = 500  # more data for better training
+
+SMA_WINDOWS = (5, 10, 20, 50)
+VOLATILITY_WINDOWS = (10, 20)
+BB_WINDOW = 20
+VOLUME_SMA_WINDOW = 10
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+MOMENTUM_PERIODS = (5, 10, 20)
+LAG_PERIODS = (1, 2, 3, 5)
+
+# Bars of close/returns/volume kept per symbol for streaming features: enough for the longest window or lookback
+STREAM_HISTORY = max(*SMA_WINDOWS, *VOLATILITY_WINDOWS, VOLUME_SMA_WINDOW, *MOMENTUM_PERIODS, *LAG_PERIODS) + 1
+
+FEATURE_CACHE_SIZE = 128  # most recent prepare_features results kept
+FEATURE_IMPORTANCE_THRESHOLD = 0.001  # forest features below this are pruned before the final fit
+
+
+@njit(cache=True)
+def _rolling_mean_std(values: np.ndarray, windows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling means and sample stds of values for several windows from one set of running sums.
+
+    Matches pandas rolling(w).mean() / .std(): NaN until a window holds w non-NaN values,
+    and exactly 0 std for windows of identical values.
+    """
+    n = values.size
+    valid = ~np.isnan(values)
+    # Centering keeps the running sums of squares small enough to avoid cancellation
+    shift = np.nanmean(values) if valid.any() else 0.0
+    centered = np.where(valid, values - shift, 0.0)
+
+    count = np.zeros(n + 1)
+    sum1 = np.zeros(n + 1)
+    sum2 = np.zeros(n + 1)
+    changes = np.zeros(n)
+    count[1:] = np.cumsum(valid.astype(np.float64))
+    sum1[1:] = np.cumsum(centered)
+    sum2[1:] = np.cumsum(centered * centered)
+    changes[1:] = np.cumsum((values[1:] != values[:-1]).astype(np.float64))
+
+    means = np.full((windows.size, n), np.nan)
+    stds = np.full((windows.size, n), np.nan)
+    for k in range(windows.size):
+        w = windows[k]
+        if w > n:
+            continue
+
+        full = count[w:] - count[:-w] == w
+        window_sum = sum1[w:] - sum1[:-w]
+        window_mean = window_sum / w
+        variance = np.maximum((sum2[w:] - sum2[:-w] - window_sum * window_mean) / (w - 1), 0.0)
+        constant = changes[w - 1 :] - changes[: n - w + 1] == 0
+
+        means[k, w - 1 :] = np.where(full, window_mean + shift, np.nan)
+        stds[k, w - 1 :] = np.where(full, np.where(constant, 0.0, np.sqrt(variance)), np.nan)
+
+    return means, stds
+
+
+def _to_np(series: pd.Series) -> np.ndarray:
+    """Float64 values of a Series, without copying when they already are"""
+    return series.to_numpy(np.float64, copy=False)
+
+
+def _ewm_mean(values: np.ndarray, *, span: int | None = None, alpha: float | None = None, min_periods: int = 0) -> np.ndarray:
+    """adjust=False exponential moving average down the rows of a 1D or 2D array"""
+    smoothed = pd.DataFrame(values).ewm(span=span, alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    return smoothed.to_numpy().reshape(values.shape)
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift a float array down by periods rows, padding with NaN like Series.shift"""
+    shifted = np.full_like(values, np.nan)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _fill_missing(values: np.ndarray) -> np.ndarray:
+    """Forward-fill then back-fill NaNs down each column of a 2D array"""
+    rows = np.arange(values.shape[0])[:, None]
+    columns = np.arange(values.shape[1])
+    # Index of the last non-NaN row seen so far, per column
+    filled = values[np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0), columns]
+    reverse = filled[::-1]
+    return reverse[np.maximum.accumulate(np.where(np.isnan(reverse), 0, rows), axis=0), columns][::-1]
+
+
+class _FastScaler:
+    """StandardScaler for a dense training matrix, without sklearn's per-call validation"""
+
+    def __init__(self, values: np.ndarray) -> None:
+        # Accumulate in float64, store in the matrix dtype so transform keeps float32 inputs float32
+        self.mean = values.mean(axis=0, dtype=np.float64).astype(values.dtype)
+        std = values.std(axis=0, dtype=np.float64)
+        self.scale = np.where(std > 0, std, 1.0).astype(values.dtype)  # constant columns are left unscaled
+
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        """Scale values with the training mean and std"""
+        return (values - self.mean) / self.scale
+
+
+def _window_stats(values: np.ndarray, window: int) -> tuple[float, float]:
+    """Mean and sample std of the last window values, NaN unless all of them are present"""
+    tail = values[-window:]
+    if tail.size < window or np.isnan(tail).any():
+        return np.nan, np.nan
+    std = 0.0 if tail.min() == tail.max() else float(tail.std(ddof=1))
+    return float(tail.mean()), std
+
+
+def _ema_step(previous: float, value: float, alpha: float) -> float:
+    """One adjust=False EMA update, seeded with the first observation"""
+    if np.isnan(previous):
+        return value
+    if np.isnan(value):
+        return previous
+    return previous + alpha * (value - previous)
+
+
+class _StreamState:
+    """Indicator state for one symbol, advanced one bar at a time to produce the same features as prepare_features"""
+
+    def __init__(self) -> None:
+        self.closes: deque[float] = deque(maxlen=STREAM_HISTORY)
+        self.returns: deque[float] = deque(maxlen=STREAM_HISTORY)
+        self.volumes: deque[float] = deque(maxlen=STREAM_HISTORY)
+        self.emas = dict.fromkeys(SMA_WINDOWS, np.nan)
+        self.macd_fast = self.macd_slow = self.macd_signal = np.nan
+        self.rsi_gain = self.rsi_loss = np.nan
+        self.bars = 0
+        # Last cleaned feature values, used to forward-fill non-finite ones like prepare_features does
+        self.features: dict[str, Any] = {}
+
+    def update(self, bar: dict[str, Any]) -> dict[str, Any]:
+        """Advance the state by one OHLCV bar and return its feature values"""
+        close = np.float64(bar["close"])
+        volume = np.float64(bar["volume"])
+        prev_close = self.closes[-1] if self.closes else np.nan
+        feats = dict(bar)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Price-based features
+            feats["returns"] = close / prev_close - 1
+            feats["log_returns"] = np.log(close / prev_close)
+            feats["high_low_ratio"] = np.float64(bar["high"]) / np.float64(bar["low"])
+            feats["close_open_ratio"] = close / np.float64(bar["open"])
+
+            self.closes.append(close)
+            self.returns.append(feats["returns"])
+            self.volumes.append(volume)
+            self.bars += 1
+
+            self._update_averages(feats, close, volume)
+            self._update_oscillators(feats, close, prev_close)
+
+        # Time-based features
+        if "date" in bar:
+            date = pd.Timestamp(bar["date"])
+            feats["date"] = date
+            feats["day_of_week"] = date.dayofweek
+            feats["day_of_month"] = date.day
+            feats["month"] = date.month
+            feats["quarter"] = date.quarter
+
+        for name, value in feats.items():
+            if isinstance(value, (int, float, np.number)) and not np.isfinite(value):
+                feats[name] = self.features.get(name, np.nan)
+
+        self.features = feats
+        return feats
+
+    def _update_averages(self, feats: dict[str, Any], close: np.float64, volume: np.float64) -> None:
+        """Moving average, volatility, Bollinger Band and volume features for the latest bar"""
+        closes = np.array(self.closes)
+
+        for window in SMA_WINDOWS:
+            sma, _ = _window_stats(closes, window)
+            self.emas[window] = _ema_step(self.emas[window], close, 2 / (window + 1))
+            feats[f"sma_{window}"] = sma
+            feats[f"ema_{window}"] = self.emas[window]
+            feats[f"price_sma_{window}_ratio"] = close / sma
+
+        returns = np.array(self.returns)
+        for window in VOLATILITY_WINDOWS:
+            feats[f"volatility_{window}"] = _window_stats(returns, window)[1]
+
+        bb_sma, bb_std = _window_stats(closes, BB_WINDOW)
+        feats["bb_upper"] = bb_sma + bb_std * 2
+        feats["bb_lower"] = bb_sma - bb_std * 2
+        feats["bb_position"] = (close - feats["bb_lower"]) / (feats["bb_upper"] - feats["bb_lower"])
+
+        volume_sma, _ = _window_stats(np.array(self.volumes), VOLUME_SMA_WINDOW)
+        feats[f"volume_sma_{VOLUME_SMA_WINDOW}"] = volume_sma
+        feats["volume_ratio"] = volume / volume_sma
+        feats["price_volume"] = close * volume
+
+    def _update_oscillators(self, feats: dict[str, Any], close: np.float64, prev_close: float) -> None:
+        """RSI, MACD, momentum and lag features for the latest bar"""
+        # Wilder's smoothing of gains and losses; the first bar has no move
+        delta = 0.0 if np.isnan(prev_close) else close - prev_close
+        self.rsi_gain = _ema_step(self.rsi_gain, max(delta, 0.0), 1 / RSI_PERIOD)
+        self.rsi_loss = _ema_step(self.rsi_loss, max(-delta, 0.0), 1 / RSI_PERIOD)
+        total = self.rsi_gain + self.rsi_loss
+        feats["rsi"] = 100.0 * self.rsi_gain / total if self.bars >= RSI_PERIOD and total > 0 else np.nan
+
+        self.macd_fast = _ema_step(self.macd_fast, close, 2 / (MACD_FAST + 1))
+        self.macd_slow = _ema_step(self.macd_slow, close, 2 / (MACD_SLOW + 1))
+        macd = self.macd_fast - self.macd_slow
+        self.macd_signal = _ema_step(self.macd_signal, macd, 2 / (MACD_SIGNAL + 1))
+        feats["macd"] = macd
+        feats["macd_signal"] = self.macd_signal
+        feats["macd_histogram"] = macd - self.macd_signal
+
+        closes = np.array(self.closes)
+        for period in MOMENTUM_PERIODS:
+            feats[f"momentum_{period}"] = close / closes[-1 - period] - 1 if closes.size > period else np.nan
+
+        for lag in LAG_PERIODS:
+            available = closes.size > lag
+            feats[f"close_lag_{lag}"] = closes[-1 - lag] if available else np.nan
+            feats[f"returns_lag_{lag}"] = self.returns[-1 - lag] if available else np.nan
+            feats[f"volume_lag_{lag}"] = self.volumes[-1 - lag] if available else np.nan
+
 
 class PriceForecaster:
     """
     Enhanced price forecasting using multiple models and techniques
     """
 
-    def __init__(self, broker_adapter: BrokerInterface) -> None:
+    def __init__(self, broker_adapter: BrokerInterface, model_dir: Path | None = None) -> None:
         self.broker_adapter = broker_adapter
+        # Trained models are persisted here so a restart reloads them instead of retraining
+        self.model_dir = model_dir or get_data_dir() / "models"
         self.models = {}
+        self.compiled_models = {}
         self.scalers = {}
         self.feature_importance = {}
+        self._feature_columns: dict[str, tuple[str, ...]] = {}
+        self._feature_positions: dict[str, np.ndarray] = {}
+        self._top_features: dict[str, list[tuple[str, float]]] = {}
+        # symbol, model_type, target_days and validation scores per model key, so nothing is parsed back out of the key
+        self._meta: dict[str, dict[str, Any]] = {}
+        self._stream_state: dict[str, _StreamState] = {}
+
+        # prepare_features results keyed by the column labels and a digest of the input frame, shared across batch_predict threads
+        self._feature_cache: OrderedDict[tuple[tuple[Any, ...], bytes], pd.DataFrame] = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
 
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare technical features for price prediction
 
+        Results are cached by the content of data, so the returned frame is shared and must not be modified.
+
         Args:
             data: OHLCV data with columns: open, high, low, close, volume
 
         Returns:
             DataFrame with engineered features
         """
-        df = data.copy()
-
-        # Price-based features
-        df["returns"] = df["close"].pct_change()
-        df["log_returns"] = np.log(df["close"] / df["close"].shift(1))
-        df["high_low_ratio"] = df["high"] / df["low"]
-        df["close_open_ratio"] = df["close"] / df["open"]
-
-        # Moving averages
-        for window in [5, 10, 20, 50]:
-            df[f"sma_{window}"] = df["close"].rolling(window=window).mean()
-            df[f"ema_{window}"] = df["close"].ewm(span=window).mean()
-            df[f"price_sma_{window}_ratio"] = df["close"] / df[f"sma_{window}"]
-
-        # Volatility features
-        df["volatility_10"] = df["returns"].rolling(window=10).std()
-        df["volatility_20"] = df["returns"].rolling(window=20).std()
-
-        # Technical indicators
-        df["rsi"] = self._calculate_rsi(df["close"], 14)
-        df["bb_upper"], df["bb_lower"] = self._calculate_bollinger_bands(df["close"], 20, 2)
-        df["bb_position"] = (df["close"] - df["bb_lower"]) / (df["bb_upper"] - df["bb_lower"])
-
-        # MACD
-        df["macd"], df["macd_signal"] = self._calculate_macd(df["close"])
-        df["macd_histogram"] = df["macd"] - df["macd_signal"]
-
-        # Volume features
-        df["volume_sma_10"] = df["volume"].rolling(window=10).mean()
-        df["volume_ratio"] = df["volume"] / df["volume_sma_10"]
-        df["price_volume"] = df["close"] * df["volume"]
-
-        # Momentum features
-        for period in [5, 10, 20]:
-            df[f"momentum_{period}"] = df["close"] / df["close"].shift(period) - 1
-
-        # Lag features
-        for lag in [1, 2, 3, 5]:
-            df[f"close_lag_{lag}"] = df["close"].shift(lag)
-            df[f"returns_lag_{lag}"] = df["returns"].shift(lag)
-            df[f"volume_lag_{lag}"] = df["volume"].shift(lag)
+        # hash_pandas_object covers the values and index but not the column labels, so those are part of the key
+        key = (tuple(data.columns), hashlib.blake2b(pd.util.hash_pandas_object(data).to_numpy().tobytes(), digest_size=16).digest())
+
+        with self._feature_cache_lock:
+            if key in self._feature_cache:
+                self._feature_cache.move_to_end(key)
+                return self._feature_cache[key]
+
+        df_features = self._compute_features(data)
+
+        with self._feature_cache_lock:
+            self._feature_cache[key] = df_features
+            if len(self._feature_cache) > FEATURE_CACHE_SIZE:
+                self._feature_cache.popitem(last=False)
+
+        return df_features
+
+    def _compute_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Engineer technical features from OHLCV data"""
+        # Features are collected as 1-D arrays and the frame is built once at the end,
+        # instead of consolidating pandas blocks on every column assignment
+        feats: dict[str, np.ndarray | pd.Series] = dict(data.items())
+        close = data["close"].to_numpy(np.float64)
+        volume = data["volume"].to_numpy(np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Price-based features
+            close_lag_1 = _shift(close, 1)
+            returns = close / close_lag_1 - 1
+            feats["returns"] = returns
+            feats["log_returns"] = np.log(close / close_lag_1)
+            feats["high_low_ratio"] = data["high"].to_numpy(np.float64) / data["low"].to_numpy(np.float64)
+            feats["close_open_ratio"] = close / data["open"].to_numpy(np.float64)
+
+            # All rolling means/stds come from one running-sum pass per input series
+            close_sma, close_std = _rolling_mean_std(close, np.array(SMA_WINDOWS))
+            _, returns_std = _rolling_mean_std(returns, np.array(VOLATILITY_WINDOWS))
+            volume_sma, _ = _rolling_mean_std(volume, np.array([VOLUME_SMA_WINDOW]))
+
+            # Moving averages
+            for i, window in enumerate(SMA_WINDOWS):
+                feats[f"sma_{window}"] = close_sma[i]
+                feats[f"ema_{window}"] = _ewm_mean(close, span=window)
+                feats[f"price_sma_{window}_ratio"] = close / close_sma[i]
+
+            # Volatility features
+            for i, window in enumerate(VOLATILITY_WINDOWS):
+                feats[f"volatility_{window}"] = returns_std[i]
+
+            # Technical indicators
+            feats["rsi"] = _to_np(self._calculate_rsi(data["close"], RSI_PERIOD))
+            bb = SMA_WINDOWS.index(BB_WINDOW)
+            bb_upper = close_sma[bb] + close_std[bb] * 2
+            bb_lower = close_sma[bb] - close_std[bb] * 2
+            feats["bb_upper"] = bb_upper
+            feats["bb_lower"] = bb_lower
+            feats["bb_position"] = (close - bb_lower) / (bb_upper - bb_lower)
+
+            # MACD
+            macd, macd_signal = map(_to_np, self._calculate_macd(data["close"]))
+            feats["macd"] = macd
+            feats["macd_signal"] = macd_signal
+            feats["macd_histogram"] = macd - macd_signal
+
+            # Volume features
+            feats[f"volume_sma_{VOLUME_SMA_WINDOW}"] = volume_sma[0]
+            feats["volume_ratio"] = volume / volume_sma[0]
+            feats["price_volume"] = close * volume
+
+            # Momentum features
+            for period in MOMENTUM_PERIODS:
+                feats[f"momentum_{period}"] = close / _shift(close, period) - 1
+
+            # Lag features
+            for lag in LAG_PERIODS:
+                feats[f"close_lag_{lag}"] = _shift(close, lag)
+                feats[f"returns_lag_{lag}"] = _shift(returns, lag)
+                feats[f"volume_lag_{lag}"] = _shift(volume, lag)
 
         # Time-based features
-        if "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"])
-            df["day_of_week"] = df["date"].dt.dayofweek
-            df["day_of_month"] = df["date"].dt.day
-            df["month"] = df["date"].dt.month
-            df["quarter"] = df["date"].dt.quarter
-
-        # Drop infinite and NaN values
-        df = df.replace([np.inf, -np.inf], np.nan)
-        return df.fillna(method="ffill").fillna(method="bfill")
+        if "date" in data.columns:
+            dates = pd.to_datetime(data["date"])
+            feats["date"] = dates
+            feats["day_of_week"] = dates.dt.dayofweek.to_numpy()
+            feats["day_of_month"] = dates.dt.day.to_numpy()
+            feats["month"] = dates.dt.month.to_numpy()
+            feats["quarter"] = dates.dt.quarter.to_numpy()
+
+        # Drop infinite and NaN values with one pass over the numeric block
+        numeric_columns = [column for column, values in feats.items() if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)]
+        values = np.column_stack([np.asarray(feats[column], dtype=np.float64) for column in numeric_columns])
+        values[~np.isfinite(values)] = np.nan
+        df = pd.DataFrame(_fill_missing(values), index=data.index, columns=numeric_columns)
+
+        if len(numeric_columns) == len(feats):
+            return df
+
+        other = pd.DataFrame({column: values for column, values in feats.items() if column not in df.columns}, index=data.index)
+        return pd.concat([df, other.ffill().bfill()], axis=1)[list(feats)]
 
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        """Calculate RSI indicator with Wilder's smoothing"""
+        values = _to_np(prices)
+        delta = np.nan_to_num(np.diff(values, prepend=values[:1]), nan=0.0)
+
+        # Wilder's smoothing is an EMA with alpha = 1 / period, run over gains and losses together
+        moves = np.column_stack((np.maximum(delta, 0.0), np.maximum(-delta, 0.0)))
+        smoothed = _ewm_mean(moves, alpha=1 / period, min_periods=period)
+        gain, loss = smoothed[:, 0], smoothed[:, 1]
+
+        total = gain + loss
+        rsi = np.divide(100.0 * gain, total, out=np.full_like(total, np.nan), where=total > 0)
+        return pd.Series(rsi, index=prices.index)
 
     def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2) -> tuple[pd.Series, pd.Series]:
         """Calculate Bollinger Bands"""
-        sma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = sma + (std * std_dev)
-        lower = sma - (std * std_dev)
-        return upper, lower
+        sma, std = _rolling_mean_std(_to_np(prices), np.array([period]))
+        upper = sma[0] + (std[0] * std_dev)
+        lower = sma[0] - (std[0] * std_dev)
+        return pd.Series(upper, index=prices.index), pd.Series(lower, index=prices.index)
 
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[pd.Series, pd.Series]:
+    def _calculate_macd(self, prices: pd.Series, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL) -> tuple[pd.Series, pd.Series]:
         """Calculate MACD indicator"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
-        return macd, macd_signal
+        values = _to_np(prices)
+        macd = _ewm_mean(values, span=fast) - _ewm_mean(values, span=slow)
+        macd_signal = _ewm_mean(macd, span=signal)
+        return pd.Series(macd, index=prices.index), pd.Series(macd_signal, index=prices.index)
 
     def train_model(
         self,
@@ -123,6 +430,7 @@ class PriceForecaster:
         data: pd.DataFrame,
         model_type: str = "random_forest",
         target_days: int = 1,
+        n_jobs: int = -1,
     ) -> dict[str, Any]:
         """
         Train a price prediction model for a symbol
@@ -132,6 +440,7 @@ class PriceForecaster:
             data: Historical OHLCV data
             model_type: Type of model ('random_forest', 'linear_regression')
             target_days: Number of days ahead to predict
+            n_jobs: Cores the random forest builds trees on, 1 when symbols are already trained in parallel
 
         Returns:
             Dictionary with model performance metrics
@@ -140,9 +449,14 @@ class PriceForecaster:
             # Prepare features
             df_features = self.prepare_features(data)
 
-            # Create target variable (future price)
-            df_features[f"target_price_{target_days}d"] = df_features["close"].shift(-target_days)
-            df_features[f"target_return_{target_days}d"] = df_features[f"target_price_{target_days}d"] / df_features["close"] - 1
+            # Create target variable (future price); assign copies, leaving the cached features untouched
+            target_price = df_features["close"].shift(-target_days)
+            df_features = df_features.assign(
+                **{
+                    f"target_price_{target_days}d": target_price,
+                    f"target_return_{target_days}d": target_price / df_features["close"] - 1,
+                }
+            )
 
             # Remove rows with NaN targets
             df_clean = df_features.dropna()
@@ -154,36 +468,34 @@ class PriceForecaster:
             # Select features for training
             feature_columns = [col for col in df_clean.columns if col not in ["date", "target_price_1d", "target_return_1d", "close"] and not col.startswith("target_")]
 
-            X = df_clean[feature_columns]
-            y = df_clean[f"target_return_{target_days}d"]  # Predict returns instead of absolute prices
+            # C-ordered float32 matrix, the layout the sklearn forest works on, so fit/predict don't copy it again
+            X = np.ascontiguousarray(df_clean[feature_columns].to_numpy(np.float32))
+            y = df_clean[f"target_return_{target_days}d"].to_numpy()  # Predict returns instead of absolute prices
 
             # Split data for training and validation
             split_idx = int(len(X) * 0.8)
-            X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-            y_train, y_val = y.iloc[:split_idx], y.iloc[split_idx:]
+            X_train, X_val = X[:split_idx], X[split_idx:]
+            y_train, y_val = y[:split_idx], y[split_idx:]
 
             # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
+            scaler = _FastScaler(X_train)
+            X_train_scaled = scaler.transform(X_train)
             X_val_scaled = scaler.transform(X_val)
 
             # Train model
-            if model_type == "random_forest":
-                model = RandomForestRegressor(
-                    n_estimators=100,
-                    max_depth=10,
-                    min_samples_split=5,
-                    min_samples_leaf=2,
-                    random_state=42,
-                )
-            elif model_type == "linear_regression":
-                model = LinearRegression()
-            else:
-                msg = f"Unknown model type: {model_type}"
-                raise ValueError(msg)
-
+            model = self._create_model(model_type, n_jobs)
             model.fit(X_train_scaled, y_train)
 
+            # Drop features the forest barely uses and refit on the narrower matrix, cutting split-scan work
+            if model_type == "random_forest":
+                keep = model.feature_importances_ > FEATURE_IMPORTANCE_THRESHOLD
+                if keep.any() and not keep.all():
+                    feature_columns = [column for column, kept in zip(feature_columns, keep, strict=True) if kept]
+                    X_train, X_val = np.ascontiguousarray(X_train[:, keep]), np.ascontiguousarray(X_val[:, keep])
+                    scaler = _FastScaler(X_train)
+                    X_train_scaled, X_val_scaled = scaler.transform(X_train), scaler.transform(X_val)
+                    model.fit(X_train_scaled, y_train)
+
             # Make predictions
             y_pred_train = model.predict(X_train_scaled)
             y_pred_val = model.predict(X_val_scaled)
@@ -196,13 +508,14 @@ class PriceForecaster:
 
             # Store model and scaler
             model_key = f"{symbol}_{model_type}_{target_days}d"
-            self.models[model_key] = model
-            self.scalers[model_key] = scaler
-
-            # Feature importance (for random forest)
-            if model_type == "random_forest":
-                feature_importance = dict(zip(feature_columns, model.feature_importances_, strict=False))
-                self.feature_importance[model_key] = feature_importance
+            self._store_model(
+                model_key,
+                model,
+                scaler,
+                feature_columns=feature_columns,
+                feature_positions=df_features.columns.get_indexer(feature_columns),
+                meta={"symbol": symbol, "model_type": model_type, "target_days": target_days, "val_r2": val_r2, "val_mse": val_mse},
+            )
 
             metrics = {
                 "symbol": symbol,
@@ -226,6 +539,120 @@ class PriceForecaster:
             logger.exception(f"Error training model for {symbol}: {e}")
             raise
 
+    def _store_model(
+        self,
+        model_key: str,
+        model: RandomForestRegressor | LinearRegression,
+        scaler: _FastScaler,
+        *,
+        feature_columns: list[str],
+        feature_positions: np.ndarray,
+        meta: dict[str, Any],
+    ) -> None:
+        """Keep a freshly trained model and its metadata for prediction, and persist it to model_dir"""
+        self.models[model_key] = model
+        self.scalers[model_key] = scaler
+
+        # Remember the feature layout so prediction can slice the latest row by position
+        self._feature_columns[model_key] = tuple(feature_columns)
+        self._feature_positions[model_key] = feature_positions
+        self._meta[model_key] = meta
+
+        if isinstance(model, RandomForestRegressor):
+            # predict_price scores one row at a time, where spreading 100 trees over a thread pool costs more than it saves
+            model.set_params(n_jobs=1)
+            self._compile_forest(model_key, model)
+
+            # Feature importance; it only changes on retraining, so rank it once here rather than per prediction
+            feature_importance = dict(zip(feature_columns, model.feature_importances_, strict=False))
+            self.feature_importance[model_key] = feature_importance
+            self._top_features[model_key] = heapq.nlargest(5, feature_importance.items(), key=lambda x: x[1])
+
+        self._save_model(model_key)
+
+    def _model_path(self, model_key: str) -> Path:
+        """File a model is persisted to"""
+        return self.model_dir / f"{model_key}.joblib"
+
+    def _save_model(self, model_key: str) -> None:
+        """Persist a trained model with everything predict_price needs alongside it"""
+        try:
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            # Uncompressed so loading can memory-map the numpy arrays
+            joblib.dump(
+                {
+                    "model": self.models[model_key],
+                    "scaler": self.scalers[model_key],
+                    "feature_columns": self._feature_columns[model_key],
+                    "feature_positions": self._feature_positions[model_key],
+                    "feature_importance": self.feature_importance.get(model_key),
+                    "top_features": self._top_features.get(model_key),
+                    "meta": self._meta[model_key],
+                },
+                self._model_path(model_key),
+            )
+        except Exception as e:
+            logger.warning(f"Could not save model {model_key}: {e}")
+
+    def _load_model(self, model_key: str) -> bool:
+        """Make sure a model is in memory, loading it from model_dir if it was trained by an earlier run"""
+        if model_key in self.models:
+            return True
+
+        path = self._model_path(model_key)
+        if not path.exists():
+            return False
+
+        try:
+            saved = joblib.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Could not load model {model_key}, it will be retrained: {e}")
+            return False
+
+        self.scalers[model_key] = saved["scaler"]
+        self._feature_columns[model_key] = saved["feature_columns"]
+        self._feature_positions[model_key] = saved["feature_positions"]
+        self._meta[model_key] = saved["meta"]
+        if saved["feature_importance"] is not None:
+            self.feature_importance[model_key] = saved["feature_importance"]
+            self._top_features[model_key] = saved["top_features"]
+        if isinstance(saved["model"], RandomForestRegressor):
+            self._compile_forest(model_key, saved["model"])
+
+        # Published last, so concurrent readers never see a model without its scaler and layout
+        self.models[model_key] = saved["model"]
+        logger.info(f"Loaded saved model {model_key}")
+        return True
+
+    def _create_model(self, model_type: str, n_jobs: int = -1) -> RandomForestRegressor | LinearRegression:
+        """Create an unfitted model of the given type, building forest trees on n_jobs cores"""
+        if model_type == "random_forest":
+            return RandomForestRegressor(
+                n_estimators=100,
+                max_depth=10,
+                min_samples_split=5,
+                min_samples_leaf=2,
+                random_state=42,
+                n_jobs=n_jobs,
+            )
+        if model_type == "linear_regression":
+            return LinearRegression()
+
+        msg = f"Unknown model type: {model_type}"
+        raise ValueError(msg)
+
+    def _compile_forest(self, model_key: str, model: RandomForestRegressor) -> None:
+        """Compile a fitted forest to native code for fast single-row prediction, if compiledtrees is installed"""
+        if not COMPILEDTREES_AVAILABLE:
+            return
+
+        try:
+            self.compiled_models[model_key] = compiledtrees.CompiledRegressionPredictor(model)
+        except Exception as e:
+            # Don't keep serving a forest compiled from an older fit
+            self.compiled_models.pop(model_key, None)
+            logger.warning(f"Could not compile model {model_key}, using sklearn predict: {e}")
+
     def predict_price(
         self,
         symbol: str,
@@ -248,7 +675,7 @@ class PriceForecaster:
         try:
             model_key = f"{symbol}_{model_type}_{target_days}d"
 
-            if model_key not in self.models:
+            if not self._load_model(model_key):
                 msg = f"No trained model found for {model_key}"
                 raise ValueError(msg)
 
@@ -258,57 +685,133 @@ class PriceForecaster:
             # Prepare features
             df_features = self.prepare_features(data)
 
-            # Get the latest row for prediction
-            latest_data = df_features.iloc[-1:]
-
-            # Select features (same as training)
-            feature_columns = [col for col in df_features.columns if col not in ["date", "target_price_1d", "target_return_1d", "close"] and not col.startswith("target_")]
-
-            X_latest = latest_data[feature_columns]
+            # Select features (same as training), re-resolving positions only if the input columns differ
+            feature_columns = self._feature_columns[model_key]
+            positions = self._feature_positions[model_key]
+            if positions.max(initial=-1) >= len(df_features.columns) or tuple(df_features.columns[positions]) != feature_columns:
+                positions = df_features.columns.get_indexer(feature_columns)
+                if (positions < 0).any():
+                    msg = f"Input data is missing features used to train {model_key}"
+                    raise ValueError(msg)
 
-            # Handle missing values
-            X_latest = X_latest.fillna(method="ffill").fillna(0)
+            # Latest row for prediction, same layout as training, with missing values as 0
+            X_latest = np.nan_to_num(np.ascontiguousarray(df_features.iloc[-1:, positions].to_numpy(np.float32)), nan=0.0)
 
             # Scale features
             X_scaled = scaler.transform(X_latest)
 
-            # Make prediction
-            predicted_return = model.predict(X_scaled)[0]
-            current_price = data["close"].iloc[-1]
-            predicted_price = current_price * (1 + predicted_return)
+            # Make prediction, through the compiled forest when there is one
+            predicted_return = self.compiled_models.get(model_key, model).predict(X_scaled)[0]
+            return self._prediction_result(
+                symbol,
+                model_key,
+                model_type=model_type,
+                target_days=target_days,
+                current_price=data["close"].iloc[-1],
+                predicted_return=predicted_return,
+            )
 
-            # Calculate confidence based on model performance
-            model_metrics = getattr(model, "_metrics", {})
-            confidence = max(0, min(1, model_metrics.get("val_r2", 0.5)))
+        except Exception as e:
+            logger.exception(f"Error predicting price for {symbol}: {e}")
+            raise
 
-            prediction_result = {
-                "symbol": symbol,
-                "current_price": current_price,
-                "predicted_price": predicted_price,
-                "predicted_return": predicted_return,
-                "predicted_change_percent": predicted_return * 100,
-                "target_days": target_days,
-                "confidence": confidence,
-                "model_type": model_type,
-                "prediction_date": datetime.now(),
-                "model_key": model_key,
-            }
+    def update_and_predict(
+        self,
+        symbol: str,
+        new_bar: dict[str, Any],
+        model_type: str = "random_forest",
+        target_days: int = 1,
+        history: pd.DataFrame | None = None,
+    ) -> dict[str, Any]:
+        """
+        Predict from a newly closed bar, updating indicator state incrementally instead of recomputing features over the full history
+
+        Args:
+            symbol: Stock symbol
+            new_bar: Latest OHLCV bar as a dict with open, high, low, close, volume (and date if used in training)
+            model_type: Type of model to use
+            target_days: Number of days ahead to predict
+            history: OHLCV data preceding new_bar, required for the first call per symbol to warm up the state
+
+        Returns:
+            Dictionary with prediction results
+        """
+        try:
+            model_key = f"{symbol}_{model_type}_{target_days}d"
+
+            if not self._load_model(model_key):
+                msg = f"No trained model found for {model_key}"
+                raise ValueError(msg)
 
-            # Add feature importance if available
-            if model_key in self.feature_importance:
-                top_features = sorted(
-                    self.feature_importance[model_key].items(),
-                    key=lambda x: x[1],
-                    reverse=True,
-                )[:5]
-                prediction_result["top_features"] = top_features
+            state = self._stream_state.get(symbol)
+            if state is None:
+                if history is None:
+                    msg = f"No streaming state for {symbol}, pass history to warm it up"
+                    raise ValueError(msg)
 
-            return prediction_result
+                # Cold start: replay the history so the state matches what prepare_features computes on it
+                state = _StreamState()
+                for bar in history.to_dict("records"):
+                    state.update(bar)
+                self._stream_state[symbol] = state
+
+            feats = state.update(new_bar)
+
+            # Feature vector in the training layout, with missing values as 0
+            X_latest = np.nan_to_num(np.array([[feats.get(column, np.nan) for column in self._feature_columns[model_key]]], dtype=np.float32), nan=0.0)
+
+            model = self.models[model_key]
+            X_scaled = self.scalers[model_key].transform(X_latest)
+            predicted_return = self.compiled_models.get(model_key, model).predict(X_scaled)[0]
+            return self._prediction_result(
+                symbol,
+                model_key,
+                model_type=model_type,
+                target_days=target_days,
+                current_price=new_bar["close"],
+                predicted_return=predicted_return,
+            )
 
         except Exception as e:
-            logger.exception(f"Error predicting price for {symbol}: {e}")
+            logger.exception(f"Error in streaming prediction for {symbol}: {e}")
             raise
 
+    def _prediction_result(
+        self,
+        symbol: str,
+        model_key: str,
+        *,
+        model_type: str,
+        target_days: int,
+        current_price: float,
+        predicted_return: float,
+    ) -> dict[str, Any]:
+        """Build the prediction dict returned by predict_price and update_and_predict"""
+        predicted_price = current_price * (1 + predicted_return)
+
+        # Calculate confidence based on model performance
+        model_metrics = getattr(self.models[model_key], "_metrics", {})
+        confidence = max(0, min(1, model_metrics.get("val_r2", 0.5)))
+
+        prediction_result = {
+            "symbol": symbol,
+            "current_price": current_price,
+            "predicted_price": predicted_price,
+            "predicted_return": predicted_return,
+            "predicted_change_percent": predicted_return * 100,
+            "target_days": target_days,
+            "confidence": confidence,
+            "model_type": model_type,
+            "prediction_date": datetime.now(),
+            "model_key": model_key,
+        }
+
+        # Add feature importance if available
+        if model_key in self._top_features:
+            prediction_result["top_features"] = list(self._top_features[model_key])
+
+        return prediction_result
+
     def batch_predict(
         self,
         symbols: list[str],
@@ -328,40 +831,67 @@ class PriceForecaster:
         Returns:
             Dictionary with predictions for each symbol
         """
-        predictions = {}
+        histories = self._fetch_histories(symbols, PREDICT_HISTORY_DAYS)
 
-        for symbol in symbols:
-            try:
-                # Get recent data for the symbol
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=200)  # Get enough data for features
+        # Models are trained into self.models, so workers must share this instance (threads, not processes);
+        # pandas and the sklearn tree code release the GIL for most of the work
+        results = Parallel(n_jobs=-1, backend="threading")(delayed(self._predict_one)(symbol, data, model_type, target_days, min_data_points) for symbol, data in histories)
 
-                data = self.alpaca_client.stock.history.get_stock_data(
-                    symbol=symbol,
-                    start=str(start_date),
-                    end=str(end_date),
-                    timeframe="1d",
-                )
+        return {symbol: prediction for symbol, prediction in results if prediction is not None}
 
-                if len(data) < min_data_points:
-                    logger.warning(f"Insufficient data for {symbol}: {len(data)} points")
-                    continue
+    def _fetch_history(self, symbol: str, days: int) -> pd.DataFrame:
+        """Fetch daily OHLCV history for a symbol"""
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days)
 
-                # Check if model exists, if not train it
-                model_key = f"{symbol}_{model_type}_{target_days}d"
-                if model_key not in self.models:
-                    logger.info(f"Training new model for {symbol}")
-                    self.train_model(symbol, data, model_type, target_days)
+        return self.alpaca_client.stock.history.get_stock_data(
+            symbol=symbol,
+            start=str(start_date),
+            end=str(end_date),
+            timeframe="1d",
+        )
+
+    def _fetch_one(self, symbol: str, days: int) -> tuple[str, pd.DataFrame | Exception]:
+        """Fetch history for a symbol, returning the error instead of raising"""
+        try:
+            return symbol, self._fetch_history(symbol, days)
+        except Exception as e:
+            logger.exception(f"Error fetching data for {symbol}: {e}")
+            return symbol, e
 
-                # Make prediction
-                prediction = self.predict_price(symbol, data, model_type, target_days)
-                predictions[symbol] = prediction
+    def _fetch_histories(self, symbols: list[str], days: int) -> list[tuple[str, pd.DataFrame | Exception]]:
+        """Fetch history for several symbols concurrently, preserving order"""
+        return Parallel(n_jobs=FETCH_WORKERS, backend="threading")(delayed(self._fetch_one)(symbol, days) for symbol in symbols)
 
-            except Exception as e:
-                logger.exception(f"Error in batch prediction for {symbol}: {e}")
-                predictions[symbol] = {"error": str(e), "symbol": symbol}
+    def _predict_one(
+        self,
+        symbol: str,
+        data: pd.DataFrame | Exception,
+        model_type: str,
+        target_days: int,
+        min_data_points: int,
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Train if needed and predict for one symbol, None when the symbol is skipped"""
+        if isinstance(data, Exception):
+            return symbol, {"error": str(data), "symbol": symbol}
 
-        return predictions
+        try:
+            if len(data) < min_data_points:
+                logger.warning(f"Insufficient data for {symbol}: {len(data)} points")
+                return symbol, None
+
+            # Check if model exists, if not train it
+            model_key = f"{symbol}_{model_type}_{target_days}d"
+            if not self._load_model(model_key):
+                logger.info(f"Training new model for {symbol}")
+                self.train_model(symbol, data, model_type, target_days, n_jobs=1)  # symbols already run in parallel
+
+            # Make prediction
+            return symbol, self.predict_price(symbol, data, model_type, target_days)
+
+        except Exception as e:
+            logger.exception(f"Error in batch prediction for {symbol}: {e}")
+            return symbol, {"error": str(e), "symbol": symbol}
 
     def get_forecast_signals(
         self,
@@ -380,62 +910,47 @@ class PriceForecaster:
         Returns:
             List of trading signals
         """
-        signals = []
-
-        for symbol, prediction in predictions.items():
-            if "error" in prediction:
-                continue
-
-            confidence = prediction.get("confidence", 0)
-            predicted_return = prediction.get("predicted_return", 0)
-
-            if confidence < min_confidence:
-                continue
-
-            # Generate buy signal for positive predictions
-            if predicted_return > min_return_threshold:
-                signals.append(
-                    {
-                        "symbol": symbol,
-                        "strategy_name": "price_forecast",
-                        "signal_type": "buy",
-                        "strength": min(1.0, predicted_return / 0.1),  # Scale by 10% max return
-                        "confidence": confidence,
-                        "price": prediction["current_price"],
-                        "timestamp": datetime.now(),
-                        "metadata": {
-                            "predicted_price": prediction["predicted_price"],
-                            "predicted_return": predicted_return,
-                            "target_days": prediction["target_days"],
-                            "model_type": prediction["model_type"],
-                        },
-                    }
-                )
-
-            # Generate sell signal for negative predictions
-            elif predicted_return < -min_return_threshold:
-                signals.append(
-                    {
-                        "symbol": symbol,
-                        "strategy_name": "price_forecast",
-                        "signal_type": "sell",
-                        "strength": min(1.0, abs(predicted_return) / 0.1),
-                        "confidence": confidence,
-                        "price": prediction["current_price"],
-                        "timestamp": datetime.now(),
-                        "metadata": {
-                            "predicted_price": prediction["predicted_price"],
-                            "predicted_return": predicted_return,
-                            "target_days": prediction["target_days"],
-                            "model_type": prediction["model_type"],
-                        },
-                    }
-                )
+        valid = {symbol: prediction for symbol, prediction in predictions.items() if "error" not in prediction}
+        if not valid:
+            return []
+
+        df = pd.DataFrame.from_dict(valid, orient="index")
+        confidence = df["confidence"].to_numpy(np.float64)
+        predicted_return = df["predicted_return"].to_numpy(np.float64)
+
+        # Buy on positive predictions, sell on negative ones
+        signal_type = np.where(
+            predicted_return > min_return_threshold,
+            "buy",
+            np.where(predicted_return < -min_return_threshold, "sell", ""),
+        )
+        strength = np.minimum(1.0, np.abs(predicted_return) / 0.1)  # Scale by 10% max return
 
         # Sort signals by strength * confidence
-        signals.sort(key=lambda s: s["strength"] * s["confidence"], reverse=True)
+        keep = np.flatnonzero((confidence >= min_confidence) & (signal_type != ""))
+        keep = keep[np.argsort(-(strength[keep] * confidence[keep]), kind="stable")]
 
-        return signals
+        df = df.iloc[keep].assign(signal_type=signal_type[keep], strength=strength[keep])
+        now = datetime.now()
+
+        return [
+            {
+                "symbol": symbol,
+                "strategy_name": "price_forecast",
+                "signal_type": row["signal_type"],
+                "strength": row["strength"],
+                "confidence": row["confidence"],
+                "price": row["current_price"],
+                "timestamp": now,
+                "metadata": {
+                    "predicted_price": row["predicted_price"],
+                    "predicted_return": row["predicted_return"],
+                    "target_days": row["target_days"],
+                    "model_type": row["model_type"],
+                },
+            }
+            for symbol, row in zip(df.index, df.to_dict(orient="records"), strict=True)
+        ]
 
     def retrain_models(
         self,
@@ -454,61 +969,38 @@ class PriceForecaster:
         Returns:
             Dictionary with training results
         """
-        results = {}
-
-        for symbol in symbols:
-            try:
-                # Get fresh data
-                end_date = datetime.now().date()
-                start_date = end_date - timedelta(days=500)  # Get more data for better training
-
-                data = self.alpaca_client.stock.history.get_stock_data(
-                    symbol=symbol,
-                    start=str(start_date),
-                    end=str(end_date),
-                    timeframe="1d",
-                )
+        histories = self._fetch_histories(symbols, RETRAIN_HISTORY_DAYS)
+        results = Parallel(n_jobs=-1, backend="threading")(delayed(self._retrain_one)(symbol, data, model_type, target_days) for symbol, data in histories)
+        return dict(results)
 
-                # Train model
-                metrics = self.train_model(symbol, data, model_type, target_days)
-                results[symbol] = metrics
+    def _retrain_one(self, symbol: str, data: pd.DataFrame | Exception, model_type: str, target_days: int) -> tuple[str, dict[str, Any]]:
+        """Train a model for one symbol, returning the error instead of raising"""
+        if isinstance(data, Exception):
+            return symbol, {"error": str(data), "symbol": symbol}
 
-            except Exception as e:
-                logger.exception(f"Error retraining model for {symbol}: {e}")
-                results[symbol] = {"error": str(e), "symbol": symbol}
+        try:
+            return symbol, self.train_model(symbol, data, model_type, target_days, n_jobs=1)  # symbols already run in parallel
 
-        return results
+        except Exception as e:
+            logger.exception(f"Error retraining model for {symbol}: {e}")
+            return symbol, {"error": str(e), "symbol": symbol}
 
     def get_model_performance_summary(self) -> dict[str, Any]:
         """Get summary of all trained models' performance"""
-        summary = {
-            "total_models": len(self.models),
-            "models_by_type": {},
-            "average_performance": {},
-            "model_details": [],
-        }
-
-        for model_key, model in self.models.items():
-            parts = model_key.split("_")
-            symbol = parts[0]
-            model_type = "_".join(parts[1:-1])
-            target_days = parts[-1]
+        metas = [self._meta[model_key] for model_key in self.models]
 
-            # Count by type
-            if model_type not in summary["models_by_type"]:
-                summary["models_by_type"][model_type] = 0
-            summary["models_by_type"][model_type] += 1
-
-            # Model details
-            metrics = getattr(model, "_metrics", {})
-            summary["model_details"].append(
+        return {
+            "total_models": len(metas),
+            "models_by_type": dict(Counter(meta["model_type"] for meta in metas)),
+            "average_performance": {},
+            "model_details": [
                 {
-                    "symbol": symbol,
-                    "model_type": model_type,
-                    "target_days": target_days,
-                    "val_r2": metrics.get("val_r2", 0),
-                    "val_mse": metrics.get("val_mse", 0),
+                    "symbol": meta["symbol"],
+                    "model_type": meta["model_type"],
+                    "target_days": meta["target_days"],
+                    "val_r2": meta["val_r2"],
+                    "val_mse": meta["val_mse"],
                 }
-            )
-
-        return summary
+                for meta in metas
+            ],
+        }
@@ -2,18 +2,38 @@
 Risk Management Module - Enhanced with Multiple Risk Controls
 """
 
+import contextlib
 import logging
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+import math
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
-from typing import Any
+from decimal import Decimal
+from typing import Any, Protocol
+
+import numpy as np
 
 from brokers.base.broker_adapter import AccountInfo, OrderRequest, Position
 
+from ._risk_kernels import compute_risk_score, stop_loss, take_profit
+
 logger = logging.getLogger(__name__)
 
+# One row per symbol in RiskManager._stops, and the trigger direction for each stop side
+STOP_DTYPE = np.dtype(
+    [
+        ("stop_price", "f8"),
+        ("entry_price", "f8"),
+        ("side_sign", "i1"),
+        ("active", "?"),
+        ("timestamp", "datetime64[us]"),
+    ]
+)
+SIDE_SIGNS = {"buy": 1, "sell": -1}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class RiskParameters:
     """Risk management parameters"""
 
@@ -28,8 +48,17 @@ class RiskParameters:
     max_sector_exposure_percent: float = 25.0  # Max 25% per sector
     correlation_threshold: float = 0.7  # Max correlation between positions
 
+    def __post_init__(self) -> None:
+        negative = [field.name for field in fields(self) if getattr(self, field.name) < 0]
+        if negative:
+            msg = f"Risk parameters must not be negative: {', '.join(negative)}"
+            raise ValueError(msg)
+        if self.correlation_threshold > 1:
+            msg = f"correlation_threshold must be at most 1, got {self.correlation_threshold}"
+            raise ValueError(msg)
 
-@dataclass
+
+@dataclass(slots=True)
 class RiskMetrics:
     """Risk metrics for a position or portfolio"""
 
@@ -43,120 +72,291 @@ class RiskMetrics:
     risk_score: float  # Overall risk score 0-1
 
 
-class RiskRule(ABC):
-    """Abstract base class for risk rules"""
+@dataclass
+class PortfolioSnapshot:
+    """Position aggregates computed once per evaluation and shared by every rule"""
+
+    market_value_sum: float
+    unrealized_pl_sum: float
+    symbols: set[str]
+    count: int
+    positions: list[Position]  # The open positions themselves, for rules written against the positions list
+
+
+class PortfolioAggregator:
+    """
+    Running position totals, adjusted per position event instead of re-summed for every order
+    """
+
+    def __init__(self) -> None:
+        self.total_market_value = 0.0
+        self.total_unrealized_pl = 0.0
+        self.symbol_counts: dict[str, int] = {}  # Symbol -> number of open positions in it
+        self.count = 0
+        self.positions: list[Position] = []
+
+        # Snapshot of the current totals, dropped whenever they change
+        self._snapshot: PortfolioSnapshot | None = None
+
+    def reset(self, positions: list[Position]) -> None:
+        """Rebuild the totals from a full positions list"""
+        count = len(positions)
+        # One pass over the positions into an (N, 2) float64 array, summed column-wise; broker Decimals are converted here
+        values = np.fromiter(((float(pos.market_value), float(pos.unrealized_pl)) for pos in positions), dtype=np.dtype((np.float64, 2)), count=count)
+        self.total_market_value, self.total_unrealized_pl = values.sum(axis=0).tolist()
+        self.symbol_counts = dict(Counter(pos.symbol for pos in positions))
+        self.count = count
+        self.positions = list(positions)
+
+        self._snapshot = None
+
+    def on_position_update(self, pos_before: Position | None, pos_after: Position | None) -> None:
+        """Apply one position event: open (None -> position), mark (position -> position) or close (position -> None)"""
+        if pos_before is not None:
+            self.total_market_value -= float(pos_before.market_value)
+            self.total_unrealized_pl -= float(pos_before.unrealized_pl)
+            self.count -= 1
+            remaining = self.symbol_counts.get(pos_before.symbol, 0) - 1
+            if remaining > 0:
+                self.symbol_counts[pos_before.symbol] = remaining
+            else:
+                self.symbol_counts.pop(pos_before.symbol, None)
+
+        if pos_after is not None:
+            self.total_market_value += float(pos_after.market_value)
+            self.total_unrealized_pl += float(pos_after.unrealized_pl)
+            self.count += 1
+            self.symbol_counts[pos_after.symbol] = self.symbol_counts.get(pos_after.symbol, 0) + 1
+
+        # A new list rather than an in-place edit, so snapshots already handed out stay unchanged
+        positions = list(self.positions)
+        if pos_before is not None:
+            with contextlib.suppress(ValueError):
+                positions.remove(pos_before)
+        if pos_after is not None:
+            positions.append(pos_after)
+        self.positions = positions
+
+        self._snapshot = None
+
+    def snapshot(self) -> PortfolioSnapshot:
+        """Current totals for the rules, rebuilt only after an update"""
+        if self._snapshot is None:
+            self._snapshot = PortfolioSnapshot(
+                market_value_sum=self.total_market_value,
+                unrealized_pl_sum=self.total_unrealized_pl,
+                symbols=set(self.symbol_counts),
+                count=self.count,
+                positions=self.positions,
+            )
+        return self._snapshot
+
+
+# A rule bound to the current RiskParameters and portfolio value: (order, account, snapshot) -> (approved, reason)
+# The reason is None when the order passes, so the happy path builds no strings
+RuleCheck = Callable[[OrderRequest, AccountInfo, PortfolioSnapshot], tuple[bool, str | None]]
+
+
+# Cost of a rule that sets no COST_HINT; rules run cheapest first: 1 arithmetic, 10 symbol lookups, 100 I/O
+DEFAULT_RULE_COST = 10
+
+
+class RiskRule(Protocol):
+    """
+    Interface for risk rules, matched structurally
+    A rule may also set COST_HINT and USES_SNAPSHOT and define its own compile; compile_rule supplies the defaults
+    """
 
-    @abstractmethod
     def evaluate(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
         positions: list[Position],
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
+    ) -> tuple[bool, str | None]:
         """
         Evaluate if order passes risk rule
-        Returns: (approved, reason)
+        positions is the PortfolioSnapshot instead when the rule sets USES_SNAPSHOT
+        Returns: (approved, reason), with reason None when approved
         """
 
 
+def rule_cost(rule: RiskRule) -> int:
+    """Relative evaluation cost of rule, DEFAULT_RULE_COST when it sets no COST_HINT"""
+    return getattr(rule, "COST_HINT", DEFAULT_RULE_COST)
+
+
+def compile_rule(rule: RiskRule, risk_params: RiskParameters, portfolio_value: float) -> RuleCheck:
+    """
+    Bind rule to risk_params and portfolio_value, through the rule's own compile when it defines one
+    Orders are checked through the flat list of functions built here, never through the rule objects
+    Raises ValueError when the parameters are invalid
+    """
+    compile_ = getattr(rule, "compile", None)
+    if compile_ is not None:
+        return compile_(risk_params, portfolio_value)
+
+    evaluate = rule.evaluate
+
+    if getattr(rule, "USES_SNAPSHOT", False):
+
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            return evaluate(order_request, account, snapshot, risk_params)
+
+    else:
+
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            return evaluate(order_request, account, snapshot.positions, risk_params)
+
+    return check
+
+
+def _require_limit(risk_params: RiskParameters, name: str) -> float:
+    """Read a risk limit, which must not be negative; a zero limit denies every order its rule checks"""
+    value = getattr(risk_params, name)
+    if value < 0:
+        msg = f"Risk parameter {name} must not be negative, got {value}"
+        raise ValueError(msg)
+    return value
+
+
 class PositionSizeRule(RiskRule):
     """Rule to limit individual position size"""
 
+    COST_HINT = 1
+    USES_SNAPSHOT = True
+
     def evaluate(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        snapshot: PortfolioSnapshot,
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
-        order_value = order_request.quantity * (order_request.price or 0)
-        max_position_value = account.portfolio_value * (risk_params.max_position_size_percent / 100)
-
-        if order_value > max_position_value:
-            return (
-                False,
-                f"Position size {order_value:.2f} exceeds maximum {max_position_value:.2f}",
-            )
+    ) -> tuple[bool, str | None]:
+        return self.compile(risk_params, float(account.portfolio_value))(order_request, account, snapshot)
+
+    def compile(self, risk_params: RiskParameters, portfolio_value: float) -> RuleCheck:
+        max_position_value = portfolio_value * (_require_limit(risk_params, "max_position_size_percent") / 100)
 
-        return True, "Position size OK"
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            order_value = float(order_request.quantity) * float(order_request.price or 0)
+
+            if order_value > max_position_value:
+                return (
+                    False,
+                    f"Position size {order_value:.2f} exceeds maximum {max_position_value:.2f}",
+                )
+
+            return True, None
+
+        return check
 
 
 class TotalExposureRule(RiskRule):
     """Rule to limit total portfolio exposure"""
 
+    COST_HINT = 1
+    USES_SNAPSHOT = True
+
     def evaluate(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        snapshot: PortfolioSnapshot,
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
-        current_exposure = sum(pos.market_value for pos in positions)
-        order_value = order_request.quantity * (order_request.price or 0)
-        total_exposure = current_exposure + order_value
+    ) -> tuple[bool, str | None]:
+        return self.compile(risk_params, float(account.portfolio_value))(order_request, account, snapshot)
 
-        max_exposure = account.portfolio_value * (risk_params.max_total_exposure_percent / 100)
+    def compile(self, risk_params: RiskParameters, portfolio_value: float) -> RuleCheck:
+        max_exposure = portfolio_value * (_require_limit(risk_params, "max_total_exposure_percent") / 100)
 
-        if total_exposure > max_exposure:
-            return (
-                False,
-                f"Total exposure {total_exposure:.2f} would exceed maximum {max_exposure:.2f}",
-            )
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            order_value = float(order_request.quantity) * float(order_request.price or 0)
+            total_exposure = snapshot.market_value_sum + order_value
+
+            if total_exposure > max_exposure:
+                return (
+                    False,
+                    f"Total exposure {total_exposure:.2f} would exceed maximum {max_exposure:.2f}",
+                )
 
-        return True, "Total exposure OK"
+            return True, None
+
+        return check
 
 
 class MaxPositionsRule(RiskRule):
     """Rule to limit number of positions"""
 
+    COST_HINT = 10
+    USES_SNAPSHOT = True
+
     def evaluate(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        snapshot: PortfolioSnapshot,
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
-        # Check if this is a new position or adding to existing
-        existing_position = any(pos.symbol == order_request.symbol for pos in positions)
-
-        if not existing_position and len(positions) >= risk_params.max_positions:
-            return (
-                False,
-                f"Maximum positions ({risk_params.max_positions}) already reached",
-            )
+    ) -> tuple[bool, str | None]:
+        return self.compile(risk_params, float(account.portfolio_value))(order_request, account, snapshot)
+
+    def compile(self, risk_params: RiskParameters, portfolio_value: float) -> RuleCheck:
+        max_positions = _require_limit(risk_params, "max_positions")
+        rejection = f"Maximum positions ({max_positions}) already reached"
+
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            # Check if this is a new position or adding to existing
+            existing_position = order_request.symbol in snapshot.symbols
 
-        return True, "Position count OK"
+            if not existing_position and snapshot.count >= max_positions:
+                return False, rejection
+
+            return True, None
+
+        return check
 
 
 class DailyLossRule(RiskRule):
     """Rule to limit daily losses"""
 
+    COST_HINT = 1
+    USES_SNAPSHOT = True
+
     def evaluate(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        snapshot: PortfolioSnapshot,
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
-        # Calculate current daily P&L
-        daily_pnl = sum(pos.unrealized_pl for pos in positions)
-        daily_pnl_percent = (daily_pnl / account.portfolio_value) * 100
+    ) -> tuple[bool, str | None]:
+        return self.compile(risk_params, float(account.portfolio_value))(order_request, account, snapshot)
 
+    def compile(self, risk_params: RiskParameters, portfolio_value: float) -> RuleCheck:
         max_loss_percent = -abs(risk_params.max_daily_loss_percent)
+        # P&L -> percent of portfolio as one multiply per order; an empty portfolio turns any loss into -inf
+        pnl_to_percent = 100 / portfolio_value if portfolio_value else math.inf
 
-        if daily_pnl_percent < max_loss_percent:
-            return (
-                False,
-                f"Daily loss {daily_pnl_percent:.2f}% exceeds limit {max_loss_percent:.2f}%",
-            )
+        def check(order_request: OrderRequest, account: AccountInfo, snapshot: PortfolioSnapshot) -> tuple[bool, str | None]:
+            # Calculate current daily P&L
+            daily_pnl_percent = snapshot.unrealized_pl_sum * pnl_to_percent
+
+            if daily_pnl_percent < max_loss_percent:
+                return (
+                    False,
+                    f"Daily loss {daily_pnl_percent:.2f}% exceeds limit {max_loss_percent:.2f}%",
+                )
+
+            return True, None
 
-        return True, "Daily loss within limits"
+        return check
 
 
 class LiquidityRule(RiskRule):
     """Rule to ensure sufficient liquidity"""
 
+    COST_HINT = 100
+    USES_SNAPSHOT = True
+
     def __init__(self, data_fetcher=None) -> None:
         self.data_fetcher = data_fetcher
 
@@ -164,21 +364,33 @@ class LiquidityRule(RiskRule):
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        snapshot: PortfolioSnapshot,
         risk_params: RiskParameters,
-    ) -> tuple[bool, str]:
+    ) -> tuple[bool, str | None]:
         if not self.data_fetcher:
-            return True, "Liquidity check skipped (no data fetcher)"
+            return True, None
 
         try:
             # Get recent volume data for the symbol
             # This would need to be implemented with actual market data
             # For now, we'll use a simplified check
-            return True, "Liquidity OK"
+            return True, None
 
         except Exception as e:
-            logger.warning(f"Could not check liquidity for {order_request.symbol}: {e}")
-            return True, "Liquidity check skipped (error)"
+            logger.warning("Could not check liquidity for %s: %s", order_request.symbol, e)
+            return True, None
+
+
+@dataclass(slots=True)
+class BoundRules:
+    """Rule checks and limits specialized for one portfolio value and set of risk parameters"""
+
+    portfolio_value: float
+    risk_params: RiskParameters
+    max_position_value: float
+    max_exposure_value: float
+    max_loss_pct: float
+    checks: list[tuple[str, RuleCheck]]  # (rule name, check), cheapest first
 
 
 class RiskManager:
@@ -189,105 +401,162 @@ class RiskManager:
     def __init__(self, risk_params: RiskParameters = None) -> None:
         self.risk_params = risk_params or RiskParameters()
         self.rules: list[RiskRule] = []
-        self.active_stops: dict[str, dict[str, Any]] = {}  # Symbol -> stop loss info
+        # Rules compiled for the last portfolio value seen, dropped whenever rules or parameters change
+        self._bound: BoundRules | None = None
+
+        # Stop losses as a struct array with spare capacity, so check_stop_losses is one array compare
+        self._stops = np.zeros(0, dtype=STOP_DTYPE)
+        self._stop_rows: dict[str, int] = {}  # Symbol -> row in _stops
+
+        # Position totals, kept current through on_position_update or rebuilt whenever a positions list is passed in
+        self.portfolio = PortfolioAggregator()
 
         # Load default rules
         self._load_default_rules()
 
     def _load_default_rules(self) -> None:
         """Load default risk rules"""
-        self.rules = [
-            PositionSizeRule(),
-            TotalExposureRule(),
-            MaxPositionsRule(),
-            DailyLossRule(),
-            LiquidityRule(),
-        ]
+        self._set_rules(
+            [
+                PositionSizeRule(),
+                TotalExposureRule(),
+                MaxPositionsRule(),
+                DailyLossRule(),
+                LiquidityRule(),
+            ]
+        )
+
+    def _set_rules(self, rules: list[RiskRule]) -> None:
+        """Order rules cheapest first and validate them, leaving the current rules in place if one can't compile"""
+        rules = sorted(rules, key=rule_cost)
+        self._compile_rules(rules, self.risk_params, 0.0)
+        self.rules, self._bound = rules, None
+
+    @staticmethod
+    def _compile_rules(rules: list[RiskRule], risk_params: RiskParameters, portfolio_value: float) -> list[tuple[str, RuleCheck]]:
+        """Bind every rule to risk_params and portfolio_value"""
+        return [(rule.__class__.__name__, compile_rule(rule, risk_params, portfolio_value)) for rule in rules]
+
+    def rebind(self, account: AccountInfo) -> BoundRules:
+        """Rules and limits specialized for the account's portfolio value, rebuilt only when it or the risk parameters change"""
+        bound = self._bound
+        portfolio_value = float(account.portfolio_value)
+        if bound is not None and bound.portfolio_value == portfolio_value and bound.risk_params is self.risk_params:
+            return bound
+
+        risk_params = self.risk_params
+        bound = BoundRules(
+            portfolio_value=portfolio_value,
+            risk_params=risk_params,
+            max_position_value=portfolio_value * (risk_params.max_position_size_percent / 100),
+            max_exposure_value=portfolio_value * (risk_params.max_total_exposure_percent / 100),
+            max_loss_pct=-abs(risk_params.max_daily_loss_percent),
+            checks=self._compile_rules(self.rules, risk_params, portfolio_value),
+        )
+
+        self._bound = bound
+        return bound
 
     def add_rule(self, rule: RiskRule) -> None:
         """Add a custom risk rule"""
-        self.rules.append(rule)
+        self._set_rules([*self.rules, rule])
         logger.info(f"Added risk rule: {rule.__class__.__name__}")
 
     def remove_rule(self, rule_class) -> None:
         """Remove a risk rule by class"""
-        self.rules = [rule for rule in self.rules if not isinstance(rule, rule_class)]
+        self._set_rules([rule for rule in self.rules if not isinstance(rule, rule_class)])
         logger.info(f"Removed risk rule: {rule_class.__name__}")
 
+    def _get_snapshot(self, positions: list[Position] | None) -> PortfolioSnapshot:
+        """
+        Portfolio totals for positions, re-summed whenever a positions list is passed in since positions may change in place
+        With positions=None the totals maintained through on_position_update are used as they are
+        """
+        if positions is not None:
+            self.portfolio.reset(positions)
+        return self.portfolio.snapshot()
+
+    def on_position_update(self, pos_before: Position | None, pos_after: Position | None) -> None:
+        """Keep the portfolio totals current from a broker position event"""
+        self.portfolio.on_position_update(pos_before, pos_after)
+
     def evaluate_order(
         self,
         order_request: OrderRequest,
         account: AccountInfo,
-        positions: list[Position],
+        positions: list[Position] | None = None,
+        fast_fail: bool = True,
     ) -> tuple[bool, list[str]]:
         """
-        Evaluate an order against all risk rules
-        Returns: (approved, list of reasons)
+        Evaluate an order against the risk rules, cheapest first
+        With fast_fail the first rejection is returned right away, otherwise every rule is run for a full audit
+        Without positions, the totals kept current by on_position_update are used
+        Returns: (approved, list of rejection reasons)
         """
-        reasons = []
+        reasons = []  # (rule name, reason) for each rejection, formatted on return
         approved = True
+        snapshot = self._get_snapshot(positions)
 
-        for rule in self.rules:
+        for rule_name, check in self.rebind(account).checks:
             try:
-                rule_approved, reason = rule.evaluate(order_request, account, positions, self.risk_params)
-                reasons.append(f"{rule.__class__.__name__}: {reason}")
+                rule_approved, reason = check(order_request, account, snapshot)
 
                 if not rule_approved:
+                    reasons.append((rule_name, reason))
                     approved = False
 
             except Exception as e:
-                logger.exception(f"Error evaluating rule {rule.__class__.__name__}: {e}")
-                reasons.append(f"{rule.__class__.__name__}: Error - {e!s}")
+                logger.exception("Error evaluating rule %s: %s", rule_name, e)
+                reasons.append((rule_name, f"Error - {e!s}"))
                 approved = False
 
-        return approved, reasons
+            if not approved and fast_fail:
+                break
+
+        return approved, [f"{rule_name}: {reason}" for rule_name, reason in reasons]
 
     def apply_position_sizing(self, order_request: OrderRequest, account: AccountInfo) -> OrderRequest:
         """
         Apply position sizing rules to order request
         """
-        max_position_value = account.portfolio_value * (self.risk_params.max_position_size_percent / 100)
+        max_position_value = self.rebind(account).max_position_value
 
         if order_request.price:
-            max_quantity = max_position_value / order_request.price
+            max_quantity = max_position_value / float(order_request.price)
 
-            if order_request.quantity > max_quantity:
-                logger.info(f"Reducing position size from {order_request.quantity} to {max_quantity}")
-                order_request.quantity = max_quantity
+            if float(order_request.quantity) > max_quantity:
+                logger.info("Reducing position size from %s to %s", order_request.quantity, max_quantity)
+                # Back to Decimal only when the order is changed, if that is what the broker sent
+                order_request.quantity = Decimal(str(max_quantity)) if isinstance(order_request.quantity, Decimal) else max_quantity
 
         return order_request
 
     def calculate_stop_loss_price(self, entry_price: float, side: str) -> float:
         """Calculate stop loss price based on risk parameters"""
-        stop_loss_multiplier = 1 - (self.risk_params.stop_loss_percent / 100)
-
-        if side.lower() == "buy":
-            return entry_price * stop_loss_multiplier
-        # sell/short
-        return entry_price * (2 - stop_loss_multiplier)
+        return stop_loss(entry_price, side.lower() == "buy", self.risk_params.stop_loss_percent)
 
     def calculate_take_profit_price(self, entry_price: float, side: str) -> float:
         """Calculate take profit price based on risk parameters"""
-        take_profit_multiplier = 1 + (self.risk_params.take_profit_percent / 100)
-
-        if side.lower() == "buy":
-            return entry_price * take_profit_multiplier
-        # sell/short
-        return entry_price * (2 - take_profit_multiplier)
+        return take_profit(entry_price, side.lower() == "buy", self.risk_params.take_profit_percent)
 
     def set_stop_loss(self, symbol: str, entry_price: float, side: str, broker_adapter=None) -> None:
         """Set stop loss for a position"""
         stop_price = self.calculate_stop_loss_price(entry_price, side)
 
-        self.active_stops[symbol] = {
-            "stop_price": stop_price,
-            "entry_price": entry_price,
-            "side": side,
-            "timestamp": datetime.now(),
-            "active": True,
-        }
+        row = self._stop_rows.get(symbol)
+        if row is None:
+            row = len(self._stop_rows)
+            if row == len(self._stops):
+                # Double the capacity, so adding stops is amortized O(1)
+                grown = np.zeros(max(8, 2 * row), dtype=STOP_DTYPE)
+                grown[:row] = self._stops
+                self._stops = grown
+            self._stop_rows[symbol] = row
+
+        # Sides other than buy/sell get a zero sign and never trigger
+        self._stops[row] = (stop_price, entry_price, SIDE_SIGNS.get(side.lower(), 0), True, datetime.now())
 
-        logger.info(f"Set stop loss for {symbol} at {stop_price}")
+        logger.info("Set stop loss for %s at %s", symbol, stop_price)
 
         # If broker adapter provided, place the stop order
         if broker_adapter:
@@ -306,39 +575,45 @@ class RiskManager:
 
     def check_stop_losses(self, positions: list[Position]) -> list[str]:
         """Check if any stop losses should be triggered"""
-        triggered_stops = []
+        if not self._stop_rows:
+            return []
 
-        for position in positions:
-            if position.symbol in self.active_stops:
-                stop_info = self.active_stops[position.symbol]
+        count = len(positions)
+        rows = np.fromiter((self._stop_rows.get(pos.symbol, -1) for pos in positions), dtype=np.intp, count=count)
+        prices = np.fromiter((pos.current_price for pos in positions), dtype=np.float64, count=count)
+        stops = self._stops[rows]
 
-                if not stop_info["active"]:
-                    continue
+        # Buy stops trigger at or below the stop price and sell stops at or above it: one signed compare for both
+        side_sign = stops["side_sign"]
+        triggered = (rows >= 0) & stops["active"] & (side_sign != 0) & (side_sign * (prices - stops["stop_price"]) <= 0)
 
-                stop_price = stop_info["stop_price"]
-                side = stop_info["side"]
+        # A stop triggers once, even if its symbol appears in several positions
+        hits = np.flatnonzero(triggered)
+        _, first = np.unique(rows[hits], return_index=True)
+        hits = hits[np.sort(first)]
+        self._stops["active"][rows[hits]] = False
 
-                # Check if stop should trigger
-                should_trigger = False
-
-                if (side.lower() == "buy" and position.current_price <= stop_price) or (side.lower() == "sell" and position.current_price >= stop_price):
-                    should_trigger = True
-
-                if should_trigger:
-                    triggered_stops.append(position.symbol)
-                    self.active_stops[position.symbol]["active"] = False
-                    logger.warning(f"Stop loss triggered for {position.symbol} at {position.current_price}")
+        triggered_stops = []
+        for i in hits.tolist():
+            position = positions[i]
+            triggered_stops.append(position.symbol)
+            logger.warning(f"Stop loss triggered for {position.symbol} at {position.current_price}")
 
         return triggered_stops
 
-    def calculate_portfolio_risk_metrics(self, account: AccountInfo, positions: list[Position]) -> RiskMetrics:
+    def calculate_portfolio_risk_metrics(self, account: AccountInfo, positions: list[Position] | None = None) -> RiskMetrics:
         """Calculate comprehensive risk metrics for the portfolio"""
 
-        total_exposure = sum(pos.market_value for pos in positions)
-        exposure_percent = (total_exposure / account.portfolio_value) * 100 if account.portfolio_value > 0 else 0
+        snapshot = self._get_snapshot(positions)
 
-        total_pnl = sum(pos.unrealized_pl for pos in positions)
-        daily_pnl_percent = (total_pnl / account.portfolio_value) * 100 if account.portfolio_value > 0 else 0
+        portfolio_value = float(account.portfolio_value)
+        to_percent = 100 / portfolio_value if portfolio_value > 0 else 0
+
+        total_exposure = snapshot.market_value_sum
+        exposure_percent = total_exposure * to_percent
+
+        total_pnl = snapshot.unrealized_pl_sum
+        daily_pnl_percent = total_pnl * to_percent
 
         # Calculate drawdown (simplified - would need historical data for accurate calculation)
         drawdown_percent = min(0, daily_pnl_percent)
@@ -347,27 +622,20 @@ class RiskManager:
         sector_exposure = {"Unknown": exposure_percent}
 
         # Risk score calculation (0-1, where 1 is highest risk)
-        risk_factors = [
-            min(1.0, exposure_percent / 100),  # Exposure risk
-            min(1.0, abs(daily_pnl_percent) / 10),  # P&L volatility risk
-            min(1.0, len(positions) / 50),  # Concentration risk
-            min(1.0, abs(drawdown_percent) / 20),  # Drawdown risk
-        ]
-
-        risk_score = sum(risk_factors) / len(risk_factors)
+        risk_score = compute_risk_score(exposure_percent, daily_pnl_percent, snapshot.count, drawdown_percent)
 
         return RiskMetrics(
             current_exposure_percent=exposure_percent,
             daily_pnl_percent=daily_pnl_percent,
             total_drawdown_percent=drawdown_percent,
-            position_count=len(positions),
+            position_count=snapshot.count,
             sector_exposure=sector_exposure,
             correlation_risk=0.0,  # Would need correlation calculation
             liquidity_risk=0.0,  # Would need liquidity analysis
             risk_score=risk_score,
         )
 
-    def get_risk_summary(self, account: AccountInfo, positions: list[Position]) -> dict[str, Any]:
+    def get_risk_summary(self, account: AccountInfo, positions: list[Position] | None = None) -> dict[str, Any]:
         """Get comprehensive risk summary"""
         metrics = self.calculate_portfolio_risk_metrics(account, positions)
 
@@ -375,7 +643,7 @@ class RiskManager:
             "risk_metrics": metrics,
             "risk_parameters": self.risk_params,
             "active_rules": [rule.__class__.__name__ for rule in self.rules],
-            "active_stops": len([stop for stop in self.active_stops.values() if stop["active"]]),
+            "active_stops": int(np.count_nonzero(self._stops["active"])),
             "risk_alerts": self._generate_risk_alerts(metrics),
             "recommendations": self._generate_risk_recommendations(metrics),
         }
@@ -415,13 +683,22 @@ class RiskManager:
 
     def update_risk_parameters(self, new_params: dict[str, Any]) -> None:
         """Update risk parameters"""
+        updates = {}
         for key, value in new_params.items():
             if hasattr(self.risk_params, key):
-                setattr(self.risk_params, key, value)
-                logger.info(f"Updated risk parameter {key} to {value}")
+                updates[key] = value
             else:
                 logger.warning(f"Unknown risk parameter: {key}")
 
+        # Validate the rules against the new parameters before switching, so invalid values leave the current ones in place
+        risk_params = replace(self.risk_params, **updates)
+        self._compile_rules(self.rules, risk_params, 0.0)
+        self.risk_params, self._bound = risk_params, None
+
+        if logger.isEnabledFor(logging.INFO):
+            for key, value in updates.items():
+                logger.info("Updated risk parameter %s to %s", key, value)
+
     def emergency_stop(self) -> bool:
         """Emergency stop - halt all trading"""
         logger.critical("EMERGENCY STOP ACTIVATED - All trading halted")
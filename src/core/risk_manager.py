@@ -2,17 +2,26 @@
 Risk Manager - Portfolio risk management and position sizing
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, fields
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
 from src.brokers.base import BrokerInterface
+from src.core._risk_kernels import stop_loss, take_profit
 from src.db.models import Signal
 
 logger = logging.getLogger(__name__)
 
+RISK_CONTEXT_TTL = 0.1  # seconds a fetched portfolio state is reused across signals
+UNKNOWN_SECTOR = "unknown"  # sector of symbols missing from the sector map
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskLimits:
     """Risk management limits"""
 
@@ -23,6 +32,28 @@ class RiskLimits:
     max_daily_loss: float = 0.02  # 2% daily loss limit
     max_position_size: float = 0.10  # 10% max position size
 
+    def __post_init__(self) -> None:
+        negative = [field.name for field in fields(self) if getattr(self, field.name) < 0]
+        if negative:
+            msg = f"Risk limits must not be negative: {', '.join(negative)}"
+            raise ValueError(msg)
+        if self.max_correlation > 1:
+            msg = f"max_correlation must be at most 1, got {self.max_correlation}"
+            raise ValueError(msg)
+
+
+@dataclass(slots=True)
+class RiskContext:
+    """Portfolio state fetched once per tick and shared by every signal and check"""
+
+    portfolio_value: float
+    positions: list[dict[str, Any]]
+    position_symbols: set[str]
+    total_exposure: float
+    sector_exposure: pd.Series  # sector -> absolute market value / portfolio value
+    fetched_at: float  # time.monotonic() of the fetch
+    pending_symbols: set[str] = field(default_factory=set)  # symbols of signals passed since the fetch, not yet in positions
+
 
 class RiskManager:
     """
@@ -30,33 +61,72 @@ class RiskManager:
     Evaluates and filters trading signals based on risk criteria
     """
 
-    def __init__(self, risk_config: dict[str, Any], broker_adapter: BrokerInterface) -> None:
+    def __init__(
+        self,
+        risk_config: dict[str, Any],
+        broker_adapter: BrokerInterface,
+        sector_of: dict[str, str] | None = None,
+    ) -> None:
         self.risk_config = risk_config
         self.broker_adapter = broker_adapter
         self.risk_limits = RiskLimits(**risk_config)
-
-    async def filter_signal(self, signal: Signal) -> dict[str, Any]:
+        self._sector_of = dict(sector_of or {})  # Symbol -> sector, loaded once
+
+        self._context: RiskContext | None = None
+
+    async def build_context(self) -> RiskContext:
+        """Fetch account and positions concurrently, reusing the last fetch for RISK_CONTEXT_TTL seconds"""
+        context = self._context
+        if context is not None and time.monotonic() - context.fetched_at < RISK_CONTEXT_TTL:
+            return context
+
+        portfolio_value, positions = await asyncio.gather(self._get_portfolio_value(), self._get_current_positions())
+        context = RiskContext(
+            portfolio_value=portfolio_value,
+            positions=positions,
+            position_symbols={pos["symbol"] for pos in positions},
+            total_exposure=sum(abs(pos["market_value"]) for pos in positions),
+            sector_exposure=self._exposure_by_sector(positions, portfolio_value),
+            fetched_at=time.monotonic(),
+        )
+
+        self._context = context
+        return context
+
+    def invalidate_context(self) -> None:
+        """Drop the cached portfolio state, so the next check refetches it; call after submitting an order"""
+        self._context = None
+
+    async def filter_signals(self, signals: list[Signal]) -> list[dict[str, Any]]:
+        """Filter a batch of signals against one fetch of the portfolio state"""
+        ctx = await self.build_context()
+        return list(await asyncio.gather(*(self._filter_with_ctx(signal, ctx) for signal in signals)))
+
+    async def filter_signal(self, signal: Signal, ctx: RiskContext | None = None) -> dict[str, Any]:
         """
         Filter trading signal through risk management checks
 
         Args:
             signal: Trading signal to evaluate
+            ctx: Portfolio state to check against, fetched from the broker when not given
 
         Returns:
             Dictionary with filtering results
         """
-        logger.info(f"🛡️ Risk filtering signal: {signal.symbol} {signal.direction}")
+        return await self._filter_with_ctx(signal, ctx or await self.build_context())
+
+    async def _filter_with_ctx(self, signal: Signal, ctx: RiskContext) -> dict[str, Any]:
+        """Run sizing and risk checks for one signal against an already fetched portfolio state"""
+        logger.info("🛡️ Risk filtering signal: %s %s", signal.symbol, signal.direction)
 
         try:
-            # Get current portfolio state
-            portfolio_value = await self._get_portfolio_value()
-            current_positions = await self._get_current_positions()
+            portfolio_value = ctx.portfolio_value
 
             # Calculate position size
-            position_size = self._calculate_position_size(signal, portfolio_value, current_positions)
+            position_size = self._calculate_position_size(signal, portfolio_value, ctx.positions)
 
             # Risk checks
-            checks = await self._run_risk_checks(signal, position_size, portfolio_value, current_positions)
+            checks = await self._run_risk_checks(signal, position_size, ctx)
 
             # Determine if signal passes all checks
             passed = all(check["passed"] for check in checks.values())
@@ -69,11 +139,14 @@ class RiskManager:
                 "exposure_percent": position_size / portfolio_value if portfolio_value > 0 else 0,
             }
 
-            if not passed:
+            if passed:
+                # The cached state doesn't show this order yet, so later signals for the symbol see it as pending
+                ctx.pending_symbols.add(signal.symbol)
+            else:
                 failed_checks = [name for name, check in checks.items() if not check["passed"]]
                 result["reason"] = f"Failed risk checks: {', '.join(failed_checks)}"
 
-            logger.info(f"✅ Risk filter result: {signal.symbol} - {'PASSED' if passed else 'REJECTED'}")
+            logger.info("✅ Risk filter result: %s - %s", signal.symbol, "PASSED" if passed else "REJECTED")
             return result
 
         except Exception as e:
@@ -129,40 +202,58 @@ class RiskManager:
         max_position_value = portfolio_value * self.risk_limits.max_position_size
         position_value = min(adjusted_position_value, max_position_value)
 
-        logger.info(f"📊 Position size calculated: ${position_value:,.2f} ({position_value / portfolio_value * 100:.1f}% of portfolio)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📊 Position size calculated: $%.2f (%.1f%% of portfolio)", position_value, position_value / portfolio_value * 100)
         return position_value
 
     async def _run_risk_checks(
         self,
         signal: Signal,
         position_size: float,
-        portfolio_value: float,
-        current_positions: list[dict[str, Any]],
+        ctx: RiskContext,
     ) -> dict[str, dict]:
         """Run all risk management checks"""
 
         checks = {}
+        portfolio_value = ctx.portfolio_value
+        current_positions = ctx.positions
+
+        # Checks 2, 3 and 5 may wait on I/O, so they run concurrently; a check that raises fails on its own
+        sector_check, correlation_check, daily_loss_check = await asyncio.gather(
+            self._check_sector_exposure(signal.symbol, position_size, portfolio_value, ctx.sector_exposure),
+            self._check_position_correlation(signal.symbol, current_positions),
+            self._check_daily_loss_limit(portfolio_value),
+            return_exceptions=True,
+        )
 
         # Check 1: Maximum exposure per trade
         checks["max_exposure_per_trade"] = self._check_max_exposure_per_trade(position_size, portfolio_value)
 
         # Check 2: Maximum exposure per sector
-        checks["max_exposure_per_sector"] = await self._check_sector_exposure(signal.symbol, position_size, portfolio_value, current_positions)
+        checks["max_exposure_per_sector"] = self._check_result("max_exposure_per_sector", sector_check)
 
         # Check 3: Position correlation
-        checks["position_correlation"] = await self._check_position_correlation(signal.symbol, current_positions)
+        checks["position_correlation"] = self._check_result("position_correlation", correlation_check)
 
         # Check 4: Portfolio risk limit
         checks["portfolio_risk_limit"] = self._check_portfolio_risk_limit(position_size, portfolio_value, current_positions)
 
         # Check 5: Daily loss limit
-        checks["daily_loss_limit"] = await self._check_daily_loss_limit(portfolio_value)
+        checks["daily_loss_limit"] = self._check_result("daily_loss_limit", daily_loss_check)
 
         # Check 6: Duplicate position
-        checks["duplicate_position"] = self._check_duplicate_position(signal.symbol, current_positions)
+        checks["duplicate_position"] = self._check_duplicate_position(signal.symbol, ctx.position_symbols, ctx.pending_symbols)
 
         return checks
 
+    @staticmethod
+    def _check_result(name: str, result: dict[str, Any] | BaseException) -> dict[str, Any]:
+        """Result of a concurrently run check, with an exception turned into a failed check"""
+        if isinstance(result, BaseException):
+            logger.error("❌ Risk check %s failed", name, exc_info=result)
+            return {"passed": False, "message": f"Risk check error: {result!s}"}
+        return result
+
     def _check_max_exposure_per_trade(self, position_size: float, portfolio_value: float) -> dict[str, Any]:
         """Check if position size exceeds maximum exposure per trade"""
         max_exposure = portfolio_value * self.risk_limits.max_exposure_per_trade
@@ -177,21 +268,42 @@ class RiskManager:
             "message": f"Position exposure: {exposure_percent:.1%} (max: {self.risk_limits.max_exposure_per_trade:.1%})",
         }
 
+    def _exposure_by_sector(self, positions: list[dict[str, Any]], portfolio_value: float) -> pd.Series:
+        """Absolute market value per sector as a fraction of the portfolio"""
+        sectors = np.array([self._sector_of.get(pos["symbol"], UNKNOWN_SECTOR) for pos in positions], dtype=object)
+        market_values = np.abs(np.array([pos["market_value"] for pos in positions], dtype=float))
+        if portfolio_value <= 0:
+            return pd.Series(dtype=float)
+        return pd.Series(market_values).groupby(sectors).sum() / portfolio_value
+
     async def _check_sector_exposure(
         self,
         symbol: str,
         position_size: float,
         portfolio_value: float,
-        current_positions: list[dict[str, Any]],
+        sector_exposure: pd.Series,
     ) -> dict[str, Any]:
         """Check sector exposure limits"""
-        # TODO: Implement sector classification and exposure calculation
-        # For now, return passed
+        max_allowed = self.risk_limits.max_exposure_per_sector
+        sector = self._sector_of.get(symbol)
+        if sector is None or portfolio_value <= 0:
+            return {
+                "passed": True,
+                "sector_exposure": 0.0,
+                "max_allowed": max_allowed,
+                "message": "Sector exposure check skipped (unknown sector)",
+            }
+
+        exposure = float(sector_exposure.get(sector, 0.0)) + position_size / portfolio_value
+        over_limit = sector_exposure.index[sector_exposure > max_allowed].tolist()
+
         return {
-            "passed": True,
-            "sector_exposure": 0.0,
-            "max_allowed": self.risk_limits.max_exposure_per_sector,
-            "message": "Sector exposure check passed",
+            "passed": exposure <= max_allowed,
+            "sector": sector,
+            "sector_exposure": exposure,
+            "max_allowed": max_allowed,
+            "sectors_over_limit": over_limit,
+            "message": f"Sector {sector} exposure: {exposure:.1%} (max: {max_allowed:.1%})",
         }
 
     async def _check_position_correlation(self, symbol: str, current_positions: list[dict[str, Any]]) -> dict[str, Any]:
@@ -232,9 +344,9 @@ class RiskManager:
             "message": "Daily loss within limits",
         }
 
-    def _check_duplicate_position(self, symbol: str, current_positions: list[dict[str, Any]]) -> dict[str, Any]:
-        """Check for duplicate positions"""
-        has_position = any(pos["symbol"] == symbol for pos in current_positions)
+    def _check_duplicate_position(self, symbol: str, position_symbols: set[str], pending_symbols: set[str]) -> dict[str, Any]:
+        """Check for duplicate positions, counting signals already passed for the symbol"""
+        has_position = symbol in position_symbols or symbol in pending_symbols
 
         return {
             "passed": not has_position,
@@ -252,31 +364,26 @@ class RiskManager:
         stop_loss_percent = 0.03  # 3% stop loss
         take_profit_percent = 0.08  # 8% take profit
 
-        if signal.direction == "buy":
-            stop_loss_price = current_price * (1 - stop_loss_percent)
-            take_profit_price = current_price * (1 + take_profit_percent)
-        else:  # sell/short
-            stop_loss_price = current_price * (1 + stop_loss_percent)
-            take_profit_price = current_price * (1 - take_profit_percent)
+        side_is_buy = signal.direction == "buy"
 
         return {
-            "stop_loss_price": stop_loss_price,
-            "take_profit_price": take_profit_price,
+            "stop_loss_price": stop_loss(current_price, side_is_buy, stop_loss_percent * 100),
+            "take_profit_price": take_profit(current_price, side_is_buy, take_profit_percent * 100),
             "risk_reward_ratio": take_profit_percent / stop_loss_percent,
         }
 
     async def get_risk_metrics(self) -> dict[str, Any]:
         """Get current portfolio risk metrics"""
         try:
-            portfolio_value = await self._get_portfolio_value()
-            current_positions = await self._get_current_positions()
+            ctx = await self.build_context()
+            portfolio_value = ctx.portfolio_value
 
             # Calculate total exposure
-            total_exposure = sum(abs(pos["market_value"]) for pos in current_positions)
+            total_exposure = ctx.total_exposure
             exposure_percent = total_exposure / portfolio_value if portfolio_value > 0 else 0
 
             # Calculate position count
-            position_count = len(current_positions)
+            position_count = len(ctx.positions)
 
             return {
                 "portfolio_value": portfolio_value,
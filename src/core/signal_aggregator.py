@@ -3,23 +3,61 @@ Signal Aggregator - Enhanced with Multiple Aggregation Methods
 """
 
 import logging
-import statistics
-from collections import defaultdict
+import math
+import re
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
 from db.repository import SignalRepository
 
 logger = logging.getLogger(__name__)
 
+# Outcome of comparing a symbol's aggregated buy and sell signals
+FINAL_NONE, FINAL_BUY, FINAL_SELL, FINAL_HOLD = range(4)
+
+AGGREGATION_CACHE_SIZE = 1024  # most recent (method, signal ids) aggregation results kept
+
+_TZ_SUFFIX = re.compile(r"(?:Z|[+-]\d{2}:?\d{2})$")  # UTC offset at the end of an ISO 8601 timestamp
+
+
+def _timestamps_ns(signals: list[dict[str, Any]]) -> np.ndarray:
+    """
+    Signal timestamps as local wall-clock nanoseconds, parsed in one batch
+    Naive timestamps are local time, as SignalRepository.add writes them; aware ones are converted to local time
+    """
+    if not signals:
+        return np.empty(0, dtype=np.int64)
+
+    raw = pd.Index([str(signal["timestamp"]) for signal in signals])
+    # utc=True keeps naive values at their wall clock and moves aware ones to UTC
+    parsed = pd.to_datetime(raw, utc=True, format="ISO8601").as_unit("ns")
+    ts_ns = parsed.asi8.copy()
+
+    aware = np.asarray(raw.str.contains(_TZ_SUFFIX), dtype=bool)
+    if aware.any():
+        ts_ns[aware] = parsed[aware].tz_convert(tzlocal()).tz_localize(None).asi8
+
+    return ts_ns
+
+
+def _mean(values: list[float]) -> float:
+    """Mean of float values, 0.0 when there are none"""
+    return math.fsum(values) / len(values) if values else 0.0
+
 
 class SignalAggregator:
     """
     Aggregates and combines signals from different strategies
     """
 
-    def __init__(self, signal_repo: SignalRepository) -> None:
+    def __init__(self, signal_repo: SignalRepository, strategy_weights: dict[str, float] | None = None) -> None:
         self.signal_repo = signal_repo
+        self.strategy_weights = dict(strategy_weights or {})  # Strategy name -> weight, 1.0 when missing
         self.aggregation_methods = {
             "weighted_average": self._weighted_average_aggregation,
             "majority_vote": self._majority_vote_aggregation,
@@ -27,6 +65,9 @@ class SignalAggregator:
             "consensus": self._consensus_aggregation,
         }
 
+        # Aggregation results keyed by method, strategy weights and signal ids, so overlapping windows reuse them
+        self._aggregation_cache: OrderedDict[tuple[str, frozenset[tuple[str, float]], tuple[Any, ...]], dict[str, Any] | None] = OrderedDict()
+
     def aggregate_signals(
         self,
         symbols: list[str] | None = None,
@@ -47,58 +88,57 @@ class SignalAggregator:
             Dict with aggregated signals per symbol
         """
         try:
-            # Get recent unprocessed signals
-            cutoff_time = datetime.now() - timedelta(minutes=time_window_minutes)
-
-            all_signals = self.signal_repo.get_unprocessed_signals()
-
-            # Filter by time and symbols
-            filtered_signals = []
-            for signal in all_signals:
-                signal_time = datetime.fromisoformat(signal["timestamp"].replace("Z", "+00:00"))
-                if signal_time >= cutoff_time:
-                    if symbols is None or signal["symbol"] in symbols:
-                        filtered_signals.append(signal)
+            # Fail fast on an unknown method, before reading any signals
+            if method not in self.aggregation_methods:
+                msg = f"Unknown aggregation method: {method}"
+                raise ValueError(msg)
 
-            # Group signals by symbol
+            # Get recent unprocessed signals
+            # The repository narrows the rows by time and symbols, so only those are fetched and parsed;
+            # generated_at is naive local time, so since uses the same clock
+            since = datetime.now() - timedelta(minutes=time_window_minutes)
+            all_signals = self.signal_repo.get_unprocessed_signals(since=since, symbols=symbols)
+
+            # Filter by time with one array compare, then by symbols
+            recent = np.flatnonzero(_timestamps_ns(all_signals) >= pd.Timestamp(since).as_unit("ns").value)
+            filtered_signals = [all_signals[i] for i in recent.tolist()]
+            if symbols is not None:
+                symbol_set = set(symbols)
+                filtered_signals = [signal for signal in filtered_signals if signal["symbol"] in symbol_set]
+
+            # Nothing to aggregate, common on idle ticks outside market hours
+            if not filtered_signals:
+                return {}
+
+            # Group signals and their distinct strategies by symbol
             signals_by_symbol = defaultdict(list)
+            strategies_by_symbol = defaultdict(set)
             for signal in filtered_signals:
                 signals_by_symbol[signal["symbol"]].append(signal)
+                strategies_by_symbol[signal["symbol"]].add(signal["strategy_name"])
 
             # Aggregate signals for each symbol
             aggregated_signals = {}
 
-            if method not in self.aggregation_methods:
-                msg = f"Unknown aggregation method: {method}"
-                raise ValueError(msg)
-
-            aggregation_func = self.aggregation_methods[method]
-
+            # (symbol, signals, strategies, aggregated buy, aggregated sell) for symbols with enough strategies
+            candidates = []
             for symbol, symbol_signals in signals_by_symbol.items():
-                # Group by signal type
-                buy_signals = [s for s in symbol_signals if s["signal_type"] == "buy"]
-                sell_signals = [s for s in symbol_signals if s["signal_type"] == "sell"]
+                strategies = strategies_by_symbol[symbol]
+                result = self._aggregate_one_symbol(symbol, symbol_signals, strategies, method, min_strategies)
+                if result is not None:
+                    candidates.append((symbol, symbol_signals, strategies, *result))
 
-                # Check if we have minimum strategies
-                total_strategies = len({s["strategy_name"] for s in symbol_signals})
-                if total_strategies < min_strategies:
-                    logger.debug(f"Skipping {symbol}: only {total_strategies} strategies (min: {min_strategies})")
-                    continue
-
-                # Aggregate buy and sell signals separately
-                aggregated_buy = aggregation_func(buy_signals) if buy_signals else None
-                aggregated_sell = aggregation_func(sell_signals) if sell_signals else None
-
-                # Determine final signal
-                final_signal = self._determine_final_signal(aggregated_buy, aggregated_sell)
+            # Determine final signals for all symbols at once
+            final_signals = self._determine_final_signals([c[3] for c in candidates], [c[4] for c in candidates])
 
+            for (symbol, symbol_signals, strategies, aggregated_buy, aggregated_sell), final_signal in zip(candidates, final_signals, strict=True):
                 if final_signal:
                     aggregated_signals[symbol] = {
                         "symbol": symbol,
                         "final_signal": final_signal,
                         "aggregated_buy": aggregated_buy,
                         "aggregated_sell": aggregated_sell,
-                        "contributing_strategies": list({s["strategy_name"] for s in symbol_signals}),
+                        "contributing_strategies": list(strategies),
                         "total_signals": len(symbol_signals),
                         "aggregation_method": method,
                         "timestamp": datetime.now(),
@@ -111,27 +151,84 @@ class SignalAggregator:
             logger.exception(f"Error aggregating signals: {e}")
             raise
 
-    def _weighted_average_aggregation(self, signals: list[dict[str, Any]]) -> dict[str, Any] | None:
-        """Aggregate signals using weighted average"""
-        if not signals:
+    def _cached_aggregation(self, method: str, signals: list[dict[str, Any]]) -> dict[str, Any] | None:
+        """Aggregate signals with method, reusing the result for the same signal ids and strategy weights"""
+        # Only the weighted average reads strategy_weights, which callers may change between calls
+        weights = frozenset(self.strategy_weights.items()) if method == "weighted_average" else frozenset()
+        key = (method, weights, tuple(signal["id"] for signal in signals))
+
+        if key in self._aggregation_cache:
+            self._aggregation_cache.move_to_end(key)
+            cached = self._aggregation_cache[key]
+            return dict(cached) if cached is not None else None
+
+        aggregated = self.aggregation_methods[method](signals)
+
+        self._aggregation_cache[key] = aggregated
+        if len(self._aggregation_cache) > AGGREGATION_CACHE_SIZE:
+            self._aggregation_cache.popitem(last=False)
+
+        # Callers get their own copy, so the cached result cannot be modified through them
+        return dict(aggregated) if aggregated is not None else None
+
+    def _aggregate_one_symbol(
+        self,
+        symbol: str,
+        symbol_signals: list[dict[str, Any]],
+        strategies: set[str],
+        method: str,
+        min_strategies: int,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None] | None:
+        """Aggregated buy and sell signals of one symbol, None when too few strategies contributed"""
+        # Check if we have minimum strategies
+        total_strategies = len(strategies)
+        if total_strategies < min_strategies:
+            logger.debug(f"Skipping {symbol}: only {total_strategies} strategies (min: {min_strategies})")
             return None
 
-        # Calculate weighted strength
-        total_weight = 0
-        weighted_strength = 0
-        strategy_weights = {}
+        # Group by signal type in one pass
+        buy_signals = []
+        sell_signals = []
+        for signal in symbol_signals:
+            if signal["signal_type"] == "buy":
+                buy_signals.append(signal)
+            elif signal["signal_type"] == "sell":
+                sell_signals.append(signal)
 
-        for signal in signals:
-            # Get strategy weight (default 1.0)
-            weight = strategy_weights.get(signal["strategy_name"], 1.0)
-            total_weight += weight
-            weighted_strength += signal["strength"] * weight
+        # Aggregate buy and sell signals separately
+        aggregated_buy = self._cached_aggregation(method, buy_signals) if buy_signals else None
+        aggregated_sell = self._cached_aggregation(method, sell_signals) if sell_signals else None
+        return aggregated_buy, aggregated_sell
 
-        if total_weight == 0:
+    def _weighted_average_aggregation(self, signals: list[dict[str, Any]]) -> dict[str, Any] | None:
+        """Aggregate signals using weighted average"""
+        if not signals:
             return None
 
-        avg_strength = weighted_strength / total_weight
-        avg_price = statistics.mean([s["price"] for s in signals if s["price"]])
+        if not self.strategy_weights:
+            # Every strategy weighs 1.0, so the weighted average is the plain mean
+            avg_strength = _mean([s["strength"] for s in signals])
+            avg_price = _mean([s["price"] for s in signals if s["price"]])
+        else:
+            # Calculate weighted strength, collecting prices in the same pass
+            total_weight = 0
+            weighted_strength = 0
+            strategy_weights = self.strategy_weights
+            prices = []
+
+            for signal in signals:
+                # Get strategy weight (default 1.0)
+                weight = strategy_weights.get(signal["strategy_name"], 1.0)
+                total_weight += weight
+                weighted_strength += signal["strength"] * weight
+                if signal["price"]:
+                    prices.append(signal["price"])
+
+            if total_weight == 0:
+                return None
+
+            avg_strength = weighted_strength / total_weight
+            avg_price = _mean(prices)
 
         return {
             "signal_type": signals[0]["signal_type"],
@@ -147,26 +244,25 @@ class SignalAggregator:
         if not signals:
             return None
 
-        # Count votes
-        signal_types = [s["signal_type"] for s in signals]
-        signal_counts = defaultdict(int)
-
-        for signal_type in signal_types:
-            signal_counts[signal_type] += 1
-
-        # Find majority
-        max_votes = max(signal_counts.values())
-        majority_signals = [sig_type for sig_type, count in signal_counts.items() if count == max_votes]
-
-        if len(majority_signals) > 1:
+        # Count votes, the top two counts telling whether there is a clear majority
+        top = Counter(s["signal_type"] for s in signals).most_common(2)
+        if len(top) > 1 and top[0][1] == top[1][1]:
             # Tie - no clear majority
             return None
 
-        majority_type = majority_signals[0]
-        majority_signals_data = [s for s in signals if s["signal_type"] == majority_type]
+        majority_type, max_votes = top[0]
+
+        # Strengths and prices of the majority signals in one pass
+        strengths = []
+        prices = []
+        for s in signals:
+            if s["signal_type"] == majority_type:
+                strengths.append(s["strength"])
+                if s["price"]:
+                    prices.append(s["price"])
 
-        avg_strength = statistics.mean([s["strength"] for s in majority_signals_data])
-        avg_price = statistics.mean([s["price"] for s in majority_signals_data if s["price"]])
+        avg_strength = _mean(strengths)
+        avg_price = _mean(prices)
 
         return {
             "signal_type": majority_type,
@@ -208,8 +304,8 @@ class SignalAggregator:
             return None
 
         signal_type = next(iter(signal_types))
-        avg_strength = statistics.mean([s["strength"] for s in signals])
-        avg_price = statistics.mean([s["price"] for s in signals if s["price"]])
+        avg_strength = _mean([s["strength"] for s in signals])
+        avg_price = _mean([s["price"] for s in signals if s["price"]])
 
         return {
             "signal_type": signal_type,
@@ -220,38 +316,51 @@ class SignalAggregator:
             "method": "consensus",
         }
 
-    def _determine_final_signal(self, buy_signal: dict[str, Any] | None = None, sell_signal: dict[str, Any] | None = None) -> dict[str, Any] | None:
-        """Determine final signal from aggregated buy/sell signals"""
-        if buy_signal is None and sell_signal is None:
-            return None
-
-        # If only one type of signal
-        if buy_signal is None:
-            return sell_signal
-        if sell_signal is None:
-            return buy_signal
+    def _determine_final_signals(
+        self,
+        buy_signals: list[dict[str, Any] | None],
+        sell_signals: list[dict[str, Any] | None],
+    ) -> list[dict[str, Any] | None]:
+        """Determine the final signal of each symbol from its aggregated buy/sell signals, comparing all symbols at once"""
+        has_buy = np.array([signal is not None for signal in buy_signals], dtype=bool)
+        has_sell = np.array([signal is not None for signal in sell_signals], dtype=bool)
 
-        # Both buy and sell signals exist - compare strength and confidence
-        buy_score = buy_signal["strength"] * buy_signal["confidence"]
-        sell_score = sell_signal["strength"] * sell_signal["confidence"]
+        # Compare strength and confidence where both buy and sell signals exist
+        buy_score = np.array([signal["strength"] * signal["confidence"] if signal else 0.0 for signal in buy_signals], dtype=np.float64)
+        sell_score = np.array([signal["strength"] * signal["confidence"] if signal else 0.0 for signal in sell_signals], dtype=np.float64)
 
         # Require significant difference to avoid trading noise
         threshold = 0.1
 
-        if buy_score > sell_score + threshold:
-            return buy_signal
-        if sell_score > buy_score + threshold:
-            return sell_signal
-        # Signals are too close - no action
-        return {
-            "signal_type": "hold",
-            "strength": 0.5,
-            "price": (buy_signal["price"] + sell_signal["price"]) / 2,
-            "confidence": 0.5,
-            "contributing_signals": buy_signal["contributing_signals"] + sell_signal["contributing_signals"],
-            "method": "conflict_resolution",
-            "reason": "buy_sell_conflict",
-        }
+        # If only one type of signal, it wins; signals that are too close mean no action
+        decisions = np.select(
+            [~has_buy & ~has_sell, ~has_buy, ~has_sell, buy_score > sell_score + threshold, sell_score > buy_score + threshold],
+            [FINAL_NONE, FINAL_SELL, FINAL_BUY, FINAL_BUY, FINAL_SELL],
+            default=FINAL_HOLD,
+        )
+
+        final_signals = []
+        for buy_signal, sell_signal, decision in zip(buy_signals, sell_signals, decisions.tolist(), strict=True):
+            if decision == FINAL_BUY:
+                final_signals.append(buy_signal)
+            elif decision == FINAL_SELL:
+                final_signals.append(sell_signal)
+            elif decision == FINAL_HOLD:
+                final_signals.append(
+                    {
+                        "signal_type": "hold",
+                        "strength": 0.5,
+                        "price": (buy_signal["price"] + sell_signal["price"]) / 2,
+                        "confidence": 0.5,
+                        "contributing_signals": buy_signal["contributing_signals"] + sell_signal["contributing_signals"],
+                        "method": "conflict_resolution",
+                        "reason": "buy_sell_conflict",
+                    }
+                )
+            else:
+                final_signals.append(None)
+
+        return final_signals
 
     def get_aggregated_signals_by_strength(
         self,
@@ -275,16 +384,12 @@ class SignalAggregator:
 
     def mark_signals_processed(self, aggregated_signals: dict[str, dict[str, Any]]) -> None:
         """Mark the signals used in aggregation as processed"""
-        try:
-            all_signal_ids = []
-
-            for symbol, _signal_data in aggregated_signals.items():
-                # Get all signals for this symbol that were processed
-                recent_signals = self.signal_repo.get_unprocessed_signals(symbol=symbol)
+        if not aggregated_signals:
+            return
 
-                # Mark them as processed
-                signal_ids = [str(s["id"]) for s in recent_signals]
-                all_signal_ids.extend(signal_ids)
+        try:
+            # One query for the unprocessed signals of the aggregated symbols
+            all_signal_ids = [str(s["id"]) for s in self.signal_repo.get_unprocessed_signals(symbols=list(aggregated_signals))]
 
             if all_signal_ids:
                 self.signal_repo.mark_processed(all_signal_ids)
@@ -296,29 +401,23 @@ class SignalAggregator:
     def get_signal_statistics(self, days_back: int = 7) -> dict[str, Any]:
         """Get statistics about recent signals"""
         try:
-            cutoff_time = datetime.now() - timedelta(days=days_back)
-
-            # Get recent signals
-            all_signals = self.signal_repo.list(limit=10000)  # Large limit to get all recent
-            recent_signals = [s for s in all_signals if datetime.fromisoformat(s["timestamp"].replace("Z", "+00:00")) >= cutoff_time]
+            # Get recent signals; generated_at is naive local time, so since uses the same clock
+            since = datetime.now() - timedelta(days=days_back)
+            all_signals = self.signal_repo.list(since=since, limit=10000)  # Large limit to get all recent
+            recent_signals = [all_signals[i] for i in np.flatnonzero(_timestamps_ns(all_signals) >= pd.Timestamp(since).as_unit("ns").value).tolist()]
 
             # Calculate statistics
             total_signals = len(recent_signals)
-            by_type = defaultdict(int)
-            by_strategy = defaultdict(int)
-            by_symbol = defaultdict(int)
-
-            for signal in recent_signals:
-                by_type[signal["signal_type"]] += 1
-                by_strategy[signal["strategy_name"]] += 1
-                by_symbol[signal["symbol"]] += 1
+            by_type = Counter(signal["signal_type"] for signal in recent_signals)
+            by_strategy = Counter(signal["strategy_name"] for signal in recent_signals)
+            by_symbol = Counter(signal["symbol"] for signal in recent_signals)
 
             return {
                 "total_signals": total_signals,
                 "time_period_days": days_back,
                 "signals_by_type": dict(by_type),
                 "signals_by_strategy": dict(by_strategy),
-                "most_active_symbols": dict(sorted(by_symbol.items(), key=lambda x: x[1], reverse=True)[:10]),
+                "most_active_symbols": dict(by_symbol.most_common(10)),
                 "average_signals_per_day": total_signals / days_back if days_back > 0 else 0,
             }
 
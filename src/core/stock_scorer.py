@@ -7,13 +7,109 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
-import pandas as pd
+import numpy as np
 from sqlmodel import Session
 
 from db.models import StockScore
+from infra.jit import njit
 
 logger = logging.getLogger(__name__)
 
+# Scoring factors in the column order of the factor score matrix
+FACTOR_NAMES = ("momentum", "volume", "volatility", "technical", "sentiment", "fundamentals")
+
+
+def _column(stocks: list[dict[str, Any]], name: str) -> np.ndarray:
+    """
+    Field of every stock as a float64 array
+    Stocks without the field (or with None) read as NaN, and a field no stock provides reads as zeros
+    """
+    if not any(name in stock for stock in stocks):
+        return np.zeros(len(stocks))
+    return np.array([stock.get(name) for stock in stocks], dtype=np.float64)
+
+
+def _percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """Percentile rank of each value, ties sharing their average rank"""
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+
+    # Runs of equal values are found on the sorted values directly, without sorting again as np.unique would
+    run_start = np.empty(len(values), dtype=bool)
+    run_start[:1] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=run_start[1:])
+    first = np.flatnonzero(run_start)
+    counts = np.diff(first, append=len(values))
+
+    # 1-based average rank of each run of equal values, spread back to the original positions
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(first + (counts + 1) / 2, counts)
+    return ranks / len(values)
+
+
+@njit(parallel=True, cache=True)
+def _score_kernel(  # noqa: PLR0917 - numba kernels take their arrays positionally
+    daily_change: np.ndarray,
+    volume_rank: np.ndarray,
+    current_price: np.ndarray,
+    market_cap: np.ndarray,
+    pe_ratio: np.ndarray,
+    weights: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Factor scores as an (N, 6) matrix in FACTOR_NAMES order, and their weighted totals
+    Written as array expressions so numba fuses them into one parallel loop, and NumPy runs them as is without numba
+    """
+    # Momentum: strong positive momentum gets higher score, capped at 10% change, and decays for negative changes
+    momentum = np.where(daily_change > 0, np.minimum(1.0, daily_change / 10.0), np.fmax(0.0, 1.0 + daily_change / 10.0))
+
+    # Volatility: daily change as proxy, moderate volatility (2-5%) gets highest score
+    abs_change = np.abs(daily_change)
+    volatility = np.where(
+        (abs_change >= 2.0) & (abs_change <= 5.0),
+        1.0,
+        np.where(abs_change < 2.0, abs_change / 2.0, np.fmax(0.0, 1.0 - (abs_change - 5.0) / 10.0)),
+    )
+
+    # Technical: when a price is known, higher prices relative to recent performance, else neutral
+    technical = np.where(current_price > 0, np.where(daily_change > 0, 0.5 + 0.3, 0.5 - 0.3), 0.5)
+
+    # Sentiment: placeholder, neutral for all stocks
+    sentiment = np.full(len(daily_change), 0.5)
+
+    # Fundamentals: neutral 0.5 plus market cap (large, then mid cap) and P/E (reasonable, then high) bonuses
+    market_cap_bonus = np.where(market_cap > 1e9, 0.2, np.where(market_cap > 1e8, 0.1, 0.0))
+    pe_bonus = np.where((pe_ratio > 0) & (pe_ratio < 25), 0.2, np.where(pe_ratio > 50, -0.1, 0.0))
+    fundamentals = np.minimum(1.0, np.maximum(0.0, 0.5 + market_cap_bonus + pe_bonus))
+
+    factor_matrix = np.empty((len(daily_change), 6))
+    factor_matrix[:, 0] = momentum
+    factor_matrix[:, 1] = volume_rank
+    factor_matrix[:, 2] = volatility
+    factor_matrix[:, 3] = technical
+    factor_matrix[:, 4] = sentiment
+    factor_matrix[:, 5] = fundamentals
+
+    total_scores = momentum * weights[0] + volume_rank * weights[1] + volatility * weights[2] + technical * weights[3] + sentiment * weights[4] + fundamentals * weights[5]
+    return factor_matrix, total_scores
+
+
+def _top_n_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the n highest scores, highest first and ties in input order, like a stable sort"""
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if n < len(scores):
+        # O(N) partial selection: everything above the nth highest score, then its ties in input order
+        nth_score = scores[np.argpartition(-scores, n - 1)[n - 1]]
+        above = np.flatnonzero(scores > nth_score)
+        idx = np.concatenate((above, np.flatnonzero(scores == nth_score)[: n - len(above)]))
+    else:
+        idx = np.arange(len(scores))
+
+    # Sort only the selected scores, highest first with the index as tie-breaker
+    return idx[np.lexsort((idx, -scores[idx]))]
+
 
 @dataclass
 class ScoringFactors:
@@ -63,6 +159,10 @@ class StockScorer:
         self.factors = ScoringFactors(**config.get("factors", {}))
         self.top_n_stocks = config.get("top_n_stocks", 30)
         self.min_score_threshold = config.get("min_score_threshold", 0.5)
+        self._weights = np.array([getattr(self.factors, name) for name in FACTOR_NAMES])
+
+        # Compile (or load the cached) scoring kernel now rather than on the first scoring run
+        _score_kernel(*([np.zeros(2)] * 5), self._weights)
 
     def score_stocks(self, screened_stocks: list[dict[str, Any]]) -> list[StockScoreResult]:
         """Score a list of screened stocks"""
@@ -71,225 +171,95 @@ class StockScorer:
 
         logger.info(f"Scoring {len(screened_stocks)} stocks")
 
-        # Convert to DataFrame for easier calculations
-        df = pd.DataFrame(screened_stocks)
-
-        # Calculate individual factor scores
-        momentum_scores = self._calculate_momentum_scores(df)
-        volume_scores = self._calculate_volume_scores(df)
-        volatility_scores = self._calculate_volatility_scores(df)
-        technical_scores = self._calculate_technical_scores(df)
-        sentiment_scores = self._calculate_sentiment_scores(df)
-        fundamental_scores = self._calculate_fundamental_scores(df)
+        # Struct-of-arrays view of the stocks for the factor math
+        daily_change = _column(screened_stocks, "daily_change")
+        volume = _column(screened_stocks, "volume")
+        current_price = _column(screened_stocks, "current_price")
+        market_cap = _column(screened_stocks, "market_cap")
+        pe_ratio = _column(screened_stocks, "pe_ratio")
+
+        # Factor scores as one (N, 6) matrix and their weighted totals, in one fused kernel
+        # Volume percentiles are ranked beforehand, unknown volume counting as zero
+        factor_matrix, total_scores = _score_kernel(
+            daily_change,
+            _percentile_ranks(np.nan_to_num(volume, nan=0.0)),
+            current_price,
+            market_cap,
+            pe_ratio,
+            self._weights,
+        )
 
-        # Combine scores
-        results = []
-        for _i, row in df.iterrows():
-            symbol = row["symbol"]
-
-            factor_scores = {
-                "momentum": momentum_scores.get(symbol, 0.0),
-                "volume": volume_scores.get(symbol, 0.0),
-                "volatility": volatility_scores.get(symbol, 0.0),
-                "technical": technical_scores.get(symbol, 0.0),
-                "sentiment": sentiment_scores.get(symbol, 0.0),
-                "fundamentals": fundamental_scores.get(symbol, 0.0),
-            }
-
-            # Calculate weighted total score
-            total_score = (
-                factor_scores["momentum"] * self.factors.momentum
-                + factor_scores["volume"] * self.factors.volume
-                + factor_scores["volatility"] * self.factors.volatility
-                + factor_scores["technical"] * self.factors.technical
-                + factor_scores["sentiment"] * self.factors.sentiment
-                + factor_scores["fundamentals"] * self.factors.fundamentals
-            )
+        # Calculate confidence based on data completeness
+        confidences = self._calculate_confidence(factor_matrix, volume, market_cap)
 
-            # Calculate confidence based on data completeness
-            confidence = self._calculate_confidence(factor_scores, row)
+        # Top N by total score, then the minimum score threshold, before any result objects are built
+        top = _top_n_indices(total_scores, self.top_n_stocks)
+        top = top[total_scores[top] >= self.min_score_threshold]
 
-            results.append(
+        # Combine scores
+        filtered_results = []
+        for i, total_score, factor_scores, confidence in zip(
+            top.tolist(),
+            total_scores[top].tolist(),
+            factor_matrix[top].tolist(),
+            confidences[top].tolist(),
+            strict=True,
+        ):
+            stock = screened_stocks[i]
+            filtered_results.append(
                 StockScoreResult(
-                    symbol=symbol,
+                    symbol=stock["symbol"],
                     total_score=total_score,
-                    factor_scores=factor_scores,
+                    factor_scores=dict(zip(FACTOR_NAMES, factor_scores, strict=True)),
                     confidence=confidence,
                     metadata={
-                        "price": row.get("current_price", 0),
-                        "volume": row.get("volume", 0),
-                        "daily_change": row.get("daily_change", 0),
-                        "market_cap": row.get("market_cap", 0),
+                        "price": stock.get("current_price", 0),
+                        "volume": stock.get("volume", 0),
+                        "daily_change": stock.get("daily_change", 0),
+                        "market_cap": stock.get("market_cap", 0),
                     },
                 )
             )
 
-        # Sort by total score and return top N
-        results.sort(key=lambda x: x.total_score, reverse=True)
-        top_results = results[: self.top_n_stocks]
-
-        # Filter by minimum score threshold
-        filtered_results = [r for r in top_results if r.total_score >= self.min_score_threshold]
-
-        logger.info(f"Scored {len(results)} stocks, returning top {len(filtered_results)} with score >= {self.min_score_threshold}")
+        logger.info(f"Scored {len(screened_stocks)} stocks, returning top {len(filtered_results)} with score >= {self.min_score_threshold}")
         return filtered_results
 
-    def _calculate_momentum_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate momentum scores based on price changes"""
-        scores = {}
-
-        for _, row in df.iterrows():
-            symbol = row["symbol"]
-            daily_change = row.get("daily_change", 0)
-
-            # Normalize daily change to 0-1 scale
-            # Strong positive momentum gets higher score
-            if daily_change > 0:
-                score = min(1.0, daily_change / 10.0)  # Cap at 10% change
-            else:
-                score = max(0.0, 1.0 + daily_change / 10.0)  # Decay for negative changes
-
-            scores[symbol] = score
-
-        return scores
-
-    def _calculate_volume_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate volume scores based on trading volume"""
-        scores = {}
-
-        # Calculate volume percentiles
-        volumes = df["volume"].fillna(0)
-        if len(volumes) > 0:
-            volume_percentiles = volumes.rank(pct=True)
-
-            for i, (_, row) in enumerate(df.iterrows()):
-                scores[row["symbol"]] = volume_percentiles.iloc[i]
-
-        return scores
-
-    def _calculate_volatility_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate volatility scores (moderate volatility preferred)"""
-        scores = {}
-
-        for _, row in df.iterrows():
-            symbol = row["symbol"]
-
-            # Use daily change as proxy for volatility
-            daily_change = abs(row.get("daily_change", 0))
-
-            # Moderate volatility (2-5%) gets highest score
-            if 2.0 <= daily_change <= 5.0:
-                score = 1.0
-            elif daily_change < 2.0:
-                score = daily_change / 2.0
-            else:
-                score = max(0.0, 1.0 - (daily_change - 5.0) / 10.0)
-
-            scores[symbol] = score
-
-        return scores
-
-    def _calculate_technical_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate technical analysis scores"""
-        scores = {}
-
-        for _, row in df.iterrows():
-            symbol = row["symbol"]
-
-            # Basic technical scoring based on available data
-            # This is a simplified version - could be enhanced with more indicators
-            score = 0.5  # Default neutral score
-
-            # Price vs moving averages (if available)
-            current_price = row.get("current_price", 0)
-            if current_price > 0:
-                # Simple heuristic: higher prices relative to recent performance
-                daily_change = row.get("daily_change", 0)
-                if daily_change > 0:
-                    score += 0.3
-                else:
-                    score -= 0.3
-
-            scores[symbol] = max(0.0, min(1.0, score))
-
-        return scores
-
-    def _calculate_sentiment_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate sentiment scores (placeholder for now)"""
-        scores = {}
-
-        # Placeholder: Return neutral sentiment for all stocks
-        # This could be enhanced with news sentiment analysis
-        for _, row in df.iterrows():
-            scores[row["symbol"]] = 0.5  # Neutral sentiment
-
-        return scores
-
-    def _calculate_fundamental_scores(self, df: pd.DataFrame) -> dict[str, float]:
-        """Calculate fundamental analysis scores"""
-        scores = {}
-
-        for _, row in df.iterrows():
-            symbol = row["symbol"]
-
-            # Basic fundamental scoring
-            score = 0.5  # Default neutral score
-
-            # Market cap consideration
-            market_cap = row.get("market_cap", 0)
-            if market_cap > 1e9:  # Large cap
-                score += 0.2
-            elif market_cap > 1e8:  # Mid cap
-                score += 0.1
-
-            # P/E ratio consideration (if available)
-            pe_ratio = row.get("pe_ratio", 0)
-            if 0 < pe_ratio < 25:  # Reasonable P/E
-                score += 0.2
-            elif pe_ratio > 50:  # High P/E
-                score -= 0.1
-
-            scores[symbol] = max(0.0, min(1.0, score))
-
-        return scores
-
-    def _calculate_confidence(self, factor_scores: dict[str, float], row: pd.Series) -> float:
-        """Calculate confidence score based on data completeness"""
+    def _calculate_confidence(self, factor_matrix: np.ndarray, volume: np.ndarray, market_cap: np.ndarray) -> np.ndarray:
+        """Calculate confidence scores based on data completeness"""
         # Count how many factors have meaningful scores
-        meaningful_factors = sum(1 for score in factor_scores.values() if score != 0.5)
-        total_factors = len(factor_scores)
+        meaningful_factors = np.count_nonzero(factor_matrix != 0.5, axis=1)
+        total_factors = factor_matrix.shape[1]
 
         # Base confidence on data completeness
         base_confidence = meaningful_factors / total_factors
 
-        # Adjust based on data quality
-        if row.get("volume", 0) > 100000:  # Good volume
-            base_confidence += 0.1
-        if row.get("market_cap", 0) > 1e8:  # Known market cap
-            base_confidence += 0.1
+        # Adjust based on data quality: good volume, known market cap
+        base_confidence = base_confidence + np.where(volume > 100000, 0.1, 0.0)
+        base_confidence = base_confidence + np.where(market_cap > 1e8, 0.1, 0.0)
 
-        return min(1.0, base_confidence)
+        return np.minimum(1.0, base_confidence)
 
     def save_scores(self, db_session: Session, scores: list[StockScoreResult]) -> None:
-        """Save stock scores to database"""
+        """Save stock scores to database, ranked in the given order (score_stocks returns them highest first)"""
         try:
-            for score_result in scores:
-                score_record = StockScore(
-                    symbol=score_result.symbol,
-                    total_score=score_result.total_score,
-                    momentum_score=score_result.factor_scores.get("momentum", 0.0),
-                    volume_score=score_result.factor_scores.get("volume", 0.0),
-                    volatility_score=score_result.factor_scores.get("volatility", 0.0),
-                    technical_score=score_result.factor_scores.get("technical", 0.0),
-                    sentiment_score=score_result.factor_scores.get("sentiment", 0.0),
-                    fundamental_score=score_result.factor_scores.get("fundamentals", 0.0),
-                    confidence=score_result.confidence,
-                    metadata=score_result.metadata,
-                    timestamp=score_result.timestamp,
-                )
-
-                db_session.add(score_record)
-
+            factors_used = dict(zip(FACTOR_NAMES, self._weights.tolist(), strict=True))
+            rows = [
+                {
+                    "symbol": score_result.symbol,
+                    "score": score_result.total_score,
+                    "rank": rank,
+                    "factors_used": factors_used,
+                    "momentum_score": score_result.factor_scores.get("momentum", 0.0),
+                    "volume_score": score_result.factor_scores.get("volume", 0.0),
+                    "volatility_score": score_result.factor_scores.get("volatility", 0.0),
+                    "technical_score": score_result.factor_scores.get("technical", 0.0),
+                    "sentiment_score": score_result.factor_scores.get("sentiment", 0.0),
+                    "fundamentals_score": score_result.factor_scores.get("fundamentals", 0.0),
+                    "scored_at": score_result.timestamp,
+                }
+                for rank, score_result in enumerate(scores, start=1)
+            ]
+            db_session.bulk_insert_mappings(StockScore, rows)
             db_session.commit()
             logger.info(f"Saved {len(scores)} stock scores to database")
 
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from core.data_fetcher import DataFetcher
@@ -134,73 +135,70 @@ class EnhancedStockScreener:
 
     async def _score_and_rank_candidates(self, candidates: pd.DataFrame, criteria: ScreeningCriteria) -> list[ScreeningResult]:
         """Score and rank candidates based on multiple factors"""
-        results = []
-
-        for _, row in candidates.iterrows():
-            try:
-                symbol = row["symbol"]
+        if candidates.empty:
+            return []
 
-                # Create basic screening result
-                result = ScreeningResult(
-                    symbol=symbol,
-                    current_price=row["price"],
-                    daily_change=row["change"],
-                    daily_change_percent=row["change"],
-                    volume=row["volume"],
-                )
+        volume = candidates["volume"].to_numpy(dtype=np.float64)
+        change = candidates["change"].to_numpy(dtype=np.float64)
+        price = candidates["price"].to_numpy(dtype=np.float64)
 
-                # Calculate score based on multiple factors
-                score = self._calculate_candidate_score(row, criteria)
-                result.score = score
+        # Score and explain all candidates with column arithmetic
+        scores = self._calculate_candidate_scores(volume, change, price, criteria)
+        reasons = self._get_scoring_reasons(volume, change, price, criteria)
 
-                # Add scoring reasons
-                result.reasons = self._get_scoring_reasons(row, criteria)
+        # Rank by score (highest first), keeping the original order of equal scores
+        order = np.argsort(-scores, kind="stable").tolist()
+        rows = list(candidates[["symbol", "price", "change", "volume"]].itertuples(index=False, name=None))
+        scores = scores.tolist()
 
-                results.append(result)
-
-            except Exception as e:
-                logger.warning(f"Error scoring candidate {row.get('symbol', 'unknown')}: {e}")
-                continue
+        results = []
+        for i in order:
+            symbol, current_price, daily_change, daily_volume = rows[i]
+            results.append(
+                ScreeningResult(
+                    symbol=symbol,
+                    current_price=current_price,
+                    daily_change=daily_change,
+                    daily_change_percent=daily_change,
+                    volume=daily_volume,
+                    score=scores[i],
+                    reasons=reasons[i],
+                )
+            )
 
-        # Sort by score (highest first)
-        results.sort(key=lambda x: x.score, reverse=True)
         return results
 
-    def _calculate_candidate_score(self, row: pd.Series, criteria: ScreeningCriteria) -> float:
-        """Calculate a score for a candidate stock"""
-        score = 0.0
-
+    def _calculate_candidate_scores(self, volume: np.ndarray, change: np.ndarray, price: np.ndarray, criteria: ScreeningCriteria) -> np.ndarray:
+        """Calculate a score for each candidate stock"""
         # Volume score (higher volume = higher score)
-        volume_score = min(row["volume"] / criteria.min_volume, 5.0)
-        score += volume_score * 0.3
+        volume_score = np.minimum(volume / criteria.min_volume, 5.0)
 
         # Price change score (both positive and negative changes can be valuable)
-        change_score = abs(row["change"]) / 10.0  # Normalize to 0-1 range typically
-        score += change_score * 0.4
+        change_score = np.abs(change) / 10.0  # Normalize to 0-1 range typically
 
         # Price stability score (avoid extreme penny stocks)
-        price_score = min(row["price"] / criteria.min_price, 3.0)
-        score += price_score * 0.3
-
-        return score
+        price_score = np.minimum(price / criteria.min_price, 3.0)
 
-    def _get_scoring_reasons(self, row: pd.Series, criteria: ScreeningCriteria) -> list[str]:
-        """Get reasons for scoring a candidate"""
-        reasons = []
-
-        if row["volume"] > criteria.min_volume * 2:
-            reasons.append("High volume")
+        return volume_score * 0.3 + change_score * 0.4 + price_score * 0.3
 
-        if abs(row["change"]) > 5.0:
-            reasons.append("Significant price movement")
+    def _get_scoring_reasons(self, volume: np.ndarray, change: np.ndarray, price: np.ndarray, criteria: ScreeningCriteria) -> list[list[str]]:
+        """Get reasons for scoring each candidate"""
+        high_volume = (volume > criteria.min_volume * 2).tolist()
+        big_move = (np.abs(change) > 5.0).tolist()
+        positive = (change > 0).tolist()
+        above_min_price = (price > criteria.min_price * 2).tolist()
 
-        if row["change"] > 0:
-            reasons.append("Positive momentum")
-        else:
-            reasons.append("Potential reversal candidate")
-
-        if row["price"] > criteria.min_price * 2:
-            reasons.append("Above minimum price threshold")
+        reasons = []
+        for is_high_volume, is_big_move, is_positive, is_above_min_price in zip(high_volume, big_move, positive, above_min_price, strict=True):
+            candidate_reasons = []
+            if is_high_volume:
+                candidate_reasons.append("High volume")
+            if is_big_move:
+                candidate_reasons.append("Significant price movement")
+            candidate_reasons.append("Positive momentum" if is_positive else "Potential reversal candidate")
+            if is_above_min_price:
+                candidate_reasons.append("Above minimum price threshold")
+            reasons.append(candidate_reasons)
 
         return reasons
 
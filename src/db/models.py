@@ -192,7 +192,10 @@ class Order(OrderBase, table=True):
 
     # Relationships
     signal: Signal | None = Relationship(back_populates="order")
-    position: Optional["Position"] = Relationship(back_populates="entry_order")
+    position: Optional["Position"] = Relationship(
+        back_populates="entry_order",
+        sa_relationship_kwargs={"foreign_keys": "[Position.entry_order_id]"},
+    )
 
 
 class PositionBase(SQLModel):
@@ -371,9 +371,16 @@ class SignalRepository(SQLiteRepository):
         ON signals(symbol, generated_at)
         """
 
+        # For time-window queries across all symbols
+        create_time_index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_signals_generated_at
+        ON signals(generated_at)
+        """
+
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(create_table_sql)
             conn.execute(create_index_sql)
+            conn.execute(create_time_index_sql)
             conn.commit()
 
     def add(self, item: dict[str, Any]) -> str:
@@ -417,6 +424,14 @@ class SignalRepository(SQLiteRepository):
             query += " AND symbol = ?"
             params.append(filters["symbol"])
 
+        if filters.get("symbols") is not None:
+            query += f" AND symbol IN ({', '.join('?' for _ in filters['symbols'])})"
+            params.extend(filters["symbols"])
+
+        if filters.get("since") is not None:
+            query += " AND generated_at >= ?"
+            params.append(filters["since"].isoformat(sep=" "))
+
         if "direction" in filters:
             query += " AND direction = ?"
             params.append(filters["direction"])
@@ -461,11 +476,19 @@ class SignalRepository(SQLiteRepository):
         affected_rows = self._execute_update(query, tuple(signal_ids))
         return affected_rows > 0
 
-    def get_unprocessed_signals(self, symbol: str | None = None) -> builtins.list[dict[str, Any]]:
-        """Get unprocessed signals"""
-        filters = {"processed": False}
+    def get_unprocessed_signals(
+        self,
+        symbol: str | None = None,
+        since: datetime | None = None,
+        symbols: builtins.list[str] | None = None,
+        limit: int | None = None,
+    ) -> builtins.list[dict[str, Any]]:
+        """Get unprocessed signals, optionally only those generated since a time or for some symbols"""
+        filters = {"processed": False, "since": since, "symbols": symbols}
         if symbol:
             filters["symbol"] = symbol
+        if limit:
+            filters["limit"] = limit
         return self.list(**filters)
 
 
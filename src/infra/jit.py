@@ -0,0 +1,31 @@
+"""
+Optional Numba JIT compilation for numeric kernels
+"""
+
+from collections.abc import Callable
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, kernels then run as plain NumPy
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: object, **kwargs: object) -> Callable[..., object]:
+    """
+    numba.njit when numba is installed, otherwise a no-op decorator.
+
+    Kernels decorated with this should be written with NumPy array
+    expressions so they stay vectorized when numba is not available.
+    Supports both ``@njit`` and ``@njit(parallel=True, ...)``.
+    """
+    if args and callable(args[0]) and not kwargs:
+        func = args[0]
+        return numba.njit(func) if NUMBA_AVAILABLE else func
+
+    def decorator(func: Callable[..., object]) -> Callable[..., object]:
+        return numba.njit(*args, **kwargs)(func) if NUMBA_AVAILABLE else func
+
+    return decorator
@@ -0,0 +1,9 @@
+"""Shared pytest setup"""
+
+import sys
+from pathlib import Path
+
+# Modules under src import each other as top-level packages (core, db, infra), as main.py and run.py arrange
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,43 @@
+"""Tests for the stock scorer"""
+
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from core.stock_scorer import FACTOR_NAMES, StockScorer, StockScoreResult
+from db.models import StockScore
+
+
+@pytest.fixture
+def db_session() -> Iterator[Session]:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_save_scores_writes_stock_score_columns(db_session: Session) -> None:
+    scorer = StockScorer({})
+    scored_at = datetime.now().replace(microsecond=0)
+    results = [
+        StockScoreResult(
+            symbol="AAPL",
+            total_score=0.9,
+            factor_scores={"momentum": 0.8, "volume": 0.7, "volatility": 0.6, "technical": 0.5, "sentiment": 0.4, "fundamentals": 0.3},
+            confidence=0.95,
+            timestamp=scored_at,
+        ),
+        StockScoreResult(symbol="MSFT", total_score=0.7, factor_scores={"momentum": 0.6}, timestamp=scored_at),
+    ]
+
+    scorer.save_scores(db_session, results)
+
+    rows = db_session.exec(select(StockScore).order_by(StockScore.rank)).all()
+    assert [(row.symbol, row.score, row.rank) for row in rows] == [("AAPL", 0.9, 1), ("MSFT", 0.7, 2)]
+    assert rows[0].fundamentals_score == 0.3
+    assert rows[0].momentum_score == 0.8
+    assert rows[1].volume_score == 0.0
+    assert rows[0].factors_used == {name: getattr(scorer.factors, name) for name in FACTOR_NAMES}
+    assert rows[0].scored_at == scored_at